@@ -28,13 +28,34 @@ Inc., 51 Franklin Street, Fifth Floor, Boston, MA 02110-1301, USA.
 
 import sys
 import os
+import stat
+import threading
 from pathlib import Path
 import shutil
-from datetime import datetime
+import time
 import argparse
 import subprocess
-import hashlib
 import fnmatch
+import functools
+import re
+import shlex
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+_print_lock = threading.Lock()
+
+
+def locked_print(*args, **kwargs):
+    """print() while holding a lock. Used by code that runs on the multi-path
+    thread pool, since print writes the text and the line ending separately
+    and concurrent lines could otherwise be spliced together."""
+    with _print_lock:
+        print(*args, **kwargs)
+
 
 # Find the directory to read/write config files
 def find_config_dir():
@@ -91,9 +112,70 @@ def load_path_configs(config_file, default=None):
         return [default]
     return [Path.home() / "Shared" / "dump"]
 
+def write_config(config_file, text):
+    """Write text to config_file through a temporary file in the same directory.
+    The temporary file is fsynced and renamed over config_file, so a crash
+    leaves either the old or the new config, never a truncated one. A
+    symlinked config file (e.g. from a dotfiles repo) has its target replaced.
+    An existing config keeps its mode; a new one is created private (0600)."""
+    config_file = os.path.realpath(config_file)
+    try:
+        mode = stat.S_IMODE(os.stat(config_file).st_mode)
+    except FileNotFoundError:
+        mode = 0o600
+    tmp = f"{config_file}.{os.getpid()}.tmp"
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        try:
+            os.write(fd, text.encode())
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        os.chmod(tmp, mode)  # exact mode, whatever the umask
+        os.replace(tmp, config_file)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
 SHARE_PATH = load_path_config('.sharepath')
 SHARED_ROOTS = load_path_configs('.shareroot', Path.home() / "Shared" / "dump")
 SHARED_ROOT = SHARED_ROOTS[0]  # primary root; backward-compat alias
+MTIME_TOLERANCE = 1  # seconds; closer modification times count as the same
+MAX_WORKERS = 8  # threads for copying or processing independent files concurrently
+LOCAL_COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)  # in-kernel copies can keep more requests queued
+FICLONE = 0x40049409  # Linux ioctl that makes dst share src's extents (reflink)
+COPY_BUFSIZE = 1 << 20  # bytes per read/write when a copy cannot stay in the kernel
+COPY_TEMP_PREFIX = '.share-tmp-'  # names of copy_local_file's temporary files
+
+
+@functools.lru_cache(maxsize=65536)
+def _share_relative(local_path, share_path):
+    """Relative path (a str) of local_path under share_path, or None if outside it.
+    Cached since commands run once per shared root."""
+    # Absolutise lexically and compare strings: no syscalls and no Path
+    # objects, unlike resolve() and relative_to()
+    abs_path = os.path.abspath(local_path)
+    if not share_path:
+        return os.path.basename(abs_path)  # fallback: just filename
+    share_str = str(share_path)
+    rel = _strip_dir_prefix(abs_path, share_str)
+    if rel is None:
+        # Only reached through a symlink (e.g. a linked directory on the path)
+        rel = _strip_dir_prefix(os.path.realpath(local_path), share_str)
+    return rel
+
+
+def _strip_dir_prefix(path, directory):
+    """Return path relative to directory ('.' if equal), or None if it is not inside it"""
+    if path == directory:
+        return '.'
+    prefix = directory.rstrip(os.sep) + os.sep
+    if path.startswith(prefix):
+        return path[len(prefix):]
+    return None
 
 
 def get_shared_path(local_path, shared_root=None):
@@ -103,34 +185,51 @@ def get_shared_path(local_path, shared_root=None):
         return None
     if shared_root is None:
         shared_root = SHARED_ROOT
-    abs_path = Path(local_path).resolve()
-    if SHARE_PATH:
-        try:
-            rel = abs_path.relative_to(SHARE_PATH)
-        except ValueError:
-            print(f"Error: {local_path} is not under SHARE_PATH ({SHARE_PATH})")
-            return None
-    else:
-        rel = abs_path.name  # fallback: just filename
+    shared_path = _map_to_shared(str(local_path), SHARE_PATH, shared_root)
+    if shared_path is None:
+        locked_print(f"Error: {local_path} is not under SHARE_PATH ({SHARE_PATH})")
+    return shared_path
+
+
+@functools.lru_cache(maxsize=65536)
+def _map_to_shared(local_path, share_path, shared_root):
+    """Shared counterpart of local_path under shared_root, or None if it is
+    outside share_path. The same path is often mapped several times in one
+    command (e.g. sync falling through to put), so the result is cached;
+    Path objects are immutable, so handing out the same one is safe."""
+    rel = _share_relative(local_path, share_path)
+    if rel is None:
+        return None
     if isinstance(shared_root, str):
-        return f"{shared_root}/{str(rel)}"
+        return f"{shared_root}/{rel}"
     else:
         return shared_root / rel
 
 
-def format_time(timestamp):
-    """Format timestamp for human-readable display"""
-    delta = datetime.now().timestamp() - timestamp
-    if delta < 60:
-        return f"{int(delta)}s ago"
-    elif delta < 3600:
-        return f"{int(delta/60)}m ago"
-    elif delta < 86400:
-        return f"{int(delta/3600)}h ago"
+def format_time(timestamp, now=None):
+    """Format timestamp for human-readable display.
+    Pass now (from time.time()) when formatting several timestamps at once."""
+    if now is None:
+        now = time.time()
+    seconds = int(now - timestamp)
+    if seconds < 60:
+        return f"{seconds}s ago"
+    elif seconds < 3600:
+        return f"{seconds // 60}m ago"
+    elif seconds < 86400:
+        return f"{seconds // 3600}h ago"
     else:
-        return f"{int(delta/86400)}d ago"
+        return f"{seconds // 86400}d ago"
     
 
+def _emit(lines):
+    """Write lines to stdout with a single write call, under the print lock"""
+    if lines:
+        text = '\n'.join(lines) + '\n'
+        with _print_lock:
+            sys.stdout.write(text)
+
+
 def ask_yes_no(prompt):
     """Prompt user for yes/no response"""
     while True:
@@ -141,21 +240,179 @@ def ask_yes_no(prompt):
             return False
 
 
-def file_exists_and_valid(path):
-    """Check if file exists and is a regular file"""
-    p = Path(path)
-    return p.exists() and p.is_file()
+def regular_file_mtime(path):
+    """Return the mtime of path if it is a regular file (following symlinks),
+    otherwise None; a single stat call"""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
+        return None
+    return st.st_mtime if stat.S_ISREG(st.st_mode) else None
+
+
+def has_entries(path):
+    """Return True if path is a directory with at least one entry, False if it
+    is an empty directory, and None if it is missing or not a directory.
+    Reads at most one directory entry."""
+    try:
+        with os.scandir(path) as it:
+            return next(it, None) is not None
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def parallel_map(fn, items, chunk=256):
+    """Return [fn(item) for item in items], computed on a thread pool.
+    Items are handed out in chunks so cheap calls such as stat on a local disk
+    are not swamped by per-task overhead, while high-latency mounts (NFS,
+    SMB, sshfs) get several requests in flight."""
+    items = list(items)
+    if len(items) <= chunk:
+        return [fn(item) for item in items]
+    chunks = [items[i:i + chunk] for i in range(0, len(items), chunk)]
+    with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(chunks))) as ex:
+        return [r for part in ex.map(lambda part: [fn(item) for item in part], chunks) for r in part]
+
+
+def stat_if_exists(path):
+    """Return os.stat(path), or None if path does not exist; one call instead of exists() + stat()"""
+    # Plain stat on purpose: statx(AT_STATX_DONT_SYNC) would only differ on
+    # network filesystems, where it may return stale mtimes, and calling it
+    # through ctypes costs more than the syscall saves on local disks
+    try:
+        return os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def same_fingerprint(st1, st2):
+    """Check whether two stat results have the same size and mtime (to the
+    nanosecond). Copies carry their source's mtime over, so a match means the
+    destination is already a copy of the source and copying again is a no-op."""
+    return (st1 is not None and st2 is not None
+            and stat.S_ISREG(st1.st_mode) and stat.S_ISREG(st2.st_mode)
+            and st1.st_size == st2.st_size and st1.st_mtime_ns == st2.st_mtime_ns)
 
 
 def path_exists_and_valid(path):
-    """Check if path exists and is a file or directory"""
-    p = Path(path)
-    return p.exists() and (p.is_file() or p.is_dir())
+    """Check if path exists and is a file or directory; a single stat call"""
+    try:
+        mode = os.stat(path).st_mode
+    except (OSError, ValueError):
+        return False
+    return stat.S_ISREG(mode) or stat.S_ISDIR(mode)
 
 
 def file_is_newer(time1, time2):
     """Check if time1 is newer than time2 with 1 second tolerance"""
-    return (time1 - time2) > 1  # 1 second tolerance
+    # Times are float seconds on purpose. Remote mtimes come from 'stat -c %Y'
+    # in whole seconds, so local and remote values must share one unit, and a
+    # float keeps sub-microsecond precision for current dates, far below the
+    # tolerance. The tolerance itself is needed for whole-second remote
+    # mtimes and filesystems with coarse timestamps (FAT, some SMB shares).
+    return (time1 - time2) > MTIME_TOLERANCE
+
+
+@functools.lru_cache(maxsize=None)
+def ssh_options():
+    """Options that let ssh/scp calls share one connection per host.
+    The first call opens a master connection that later ssh and scp processes
+    reuse, skipping the TCP and authentication handshake for every file."""
+    ssh_dir = Path.home() / '.ssh'
+    if not ssh_dir.is_dir():
+        return ()  # no private place for the control socket
+    return ('-o', 'ControlMaster=auto',
+            '-o', f'ControlPath={ssh_dir}/share-%C',
+            '-o', 'ControlPersist=60s')
+
+
+def make_remote_dirs(remote_dirs):
+    """Create remote directories given as {(user, host): set of paths} with one
+    ssh call per host (per batch of paths) instead of one per file"""
+    for (user, host), dirs in remote_dirs.items():
+        dirs = sorted(dirs)
+        for i in range(0, len(dirs), 512):
+            batch = ' '.join(shlex.quote(d) for d in dirs[i:i + 512])
+            subprocess.run(['ssh', *ssh_options(), f'{user}@{host}', f'mkdir -p {batch}'],
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def _copy_in_kernel(src_fd, dst_fd):
+    """Copy an open file without passing data through userspace: reflink it
+    where the filesystem supports it, otherwise use copy_file_range, then
+    sendfile. Returns False (with dst truncated) if none of them applies."""
+    if fcntl is not None:
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            return True
+        except OSError:
+            pass
+    size = os.fstat(src_fd).st_size
+    # sendfile can only write to a regular file on Linux
+    sendfile = _sendfile_range if sys.platform.startswith('linux') else None
+    for copy_range in (getattr(os, 'copy_file_range', None), sendfile):
+        if copy_range is None:
+            continue
+        copied = 0
+        try:
+            while copied < size:
+                n = copy_range(src_fd, dst_fd, min(size - copied, 1 << 30))
+                if n == 0:
+                    break
+                copied += n
+        except OSError:
+            pass  # e.g. EXDEV across filesystems on older kernels
+        if copied == size:
+            return True
+        os.lseek(src_fd, 0, os.SEEK_SET)
+        os.lseek(dst_fd, 0, os.SEEK_SET)
+        os.ftruncate(dst_fd, 0)
+    return False
+
+
+def _sendfile_range(src_fd, dst_fd, count):
+    """os.sendfile with the same argument order as os.copy_file_range"""
+    return os.sendfile(dst_fd, src_fd, None, count)
+
+
+def copy_local_file(src, dst):
+    """Copy file contents, permission bits and timestamps, copying in-kernel
+    when possible. Unlike shutil.copy2, extended attributes and file flags
+    are not copied; share only relies on the mtime.
+    The copy is written to a temporary file next to dst and renamed over it,
+    so readers and interrupted copies never see a partially written dst."""
+    dst = str(dst)
+    if os.path.islink(dst):
+        dst = os.path.realpath(dst)  # replace the link's target, not the link
+    # A short unique name, so names near NAME_MAX can still be copied; the
+    # prefix keeps one left behind by a killed copy out of listings
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(dst), prefix=COPY_TEMP_PREFIX)
+    try:
+        with open(fd, 'wb') as fdst, open(src, 'rb') as fsrc:
+            src_stat = os.fstat(fsrc.fileno())
+            if not _copy_in_kernel(fsrc.fileno(), fdst.fileno()):
+                # Plain read/write loop, with larger blocks than shutil's default
+                fsrc.seek(0)
+                fdst.seek(0)
+                shutil.copyfileobj(fsrc, fdst, COPY_BUFSIZE)
+        # Apply metadata from the stat taken above instead of copystat's own stat
+        os.chmod(tmp, stat.S_IMODE(src_stat.st_mode))
+        os.utime(tmp, ns=(src_stat.st_atime_ns, src_stat.st_mtime_ns))
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+@functools.lru_cache(maxsize=None)
+def ensure_dir(directory):
+    """Create directory and its parents if needed. Remembered per process, so
+    copying many files into one directory only checks it once."""
+    if directory:
+        os.makedirs(directory, exist_ok=True)
 
 
 def file_copy(src, dst, **kwargs):
@@ -167,50 +424,172 @@ def file_copy(src, dst, **kwargs):
     src_str = str(src)
     dst_str = str(dst)
     
-    # Check if src or dst looks like a remote SSH path (contains '@' and ':')
-    is_remote_src = '@' in src_str and ':' in src_str
-    is_remote_dst = '@' in dst_str and ':' in dst_str
+    # Remote SSH paths (user@host:path) are always passed as str and local
+    # paths as Path, so the type alone tells them apart
+    is_remote_src = isinstance(src, str)
+    is_remote_dst = isinstance(dst, str)
     
     if is_remote_src or is_remote_dst:
         # Use scp for remote transfer
         # First, ensure destination directory exists for remote dst
-        if is_remote_dst:
-            # Parse dst: user@host:path
-            import re
-            match = re.match(r'([^@]+)@([^:]+):(.*)', dst_str)
-            if match:
-                user, host, path = match.groups()
+        if is_remote_dst and not kwargs.get('remote_dirs_ready', False):
+            user, host, path = parse_remote_path(dst_str)
+            if user:
                 parent_path = os.path.dirname(path)
                 if parent_path and parent_path != '/':
                     try:
-                        subprocess.run(['ssh', f'{user}@{host}', 'mkdir', '-p', parent_path], check=True)
+                        subprocess.run(['ssh', *ssh_options(), f'{user}@{host}', 'mkdir', '-p', parent_path], check=True)
                     except subprocess.CalledProcessError:
                         pass  # ignore if mkdir fails
         try:
-            subprocess.run(['scp', '-p', src_str, dst_str], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
+            subprocess.run(['scp', *ssh_options(), '-p', src_str, dst_str], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
         except subprocess.CalledProcessError as e:
             raise Exception(f"SCP failed: {e}")
     else:
         # Local copy
-        shutil.copy2(src, dst)
+        copy_local_file(src, dst)
     
     # Handle AppleDouble cleanup only for local destinations
     if not is_remote_dst:
         dst_path = Path(dst)
         apple_double = dst_path.parent / ("._" + dst_path.name)
-        if apple_double.exists():
-            try:
-                apple_double.unlink()
-            except Exception:
-                pass
+        try:
+            apple_double.unlink()
+        except OSError:
+            pass  # usually FileNotFoundError: nothing to clean up
 
 
+def run_copies(jobs, **kwargs):
+    """Run (src, dst, done_msg, error_msg) copy jobs on a thread pool.
+    Messages are printed in job order; returns the number of files copied."""
+    if not jobs:
+        return 0
+
+    # Create all remote destination directories up front in one batch
+    remote_dirs = {}
+    remote = False
+    for src, dst, _, _ in jobs:
+        remote = remote or isinstance(src, str) or isinstance(dst, str)
+        if isinstance(dst, str):
+            user, host, path = parse_remote_path(dst)
+            parent_path = os.path.dirname(path)
+            if user and parent_path and parent_path != '/':
+                remote_dirs.setdefault((user, host), set()).add(parent_path)
+    if remote_dirs and not kwargs.get('preview', False):
+        make_remote_dirs(remote_dirs)
+        kwargs = dict(kwargs, remote_dirs_ready=True)
+
+    def copy(job):
+        try:
+            file_copy(job[0], job[1], **kwargs)
+        except Exception as e:
+            return e
+        return None
+
+    # scp sessions share one multiplexed connection, which sshd caps at ten
+    # sessions by default; purely local copies can run with a deeper queue
+    workers = MAX_WORKERS if remote else LOCAL_COPY_WORKERS
+    count = 0
+    with ThreadPoolExecutor(max_workers=min(workers, len(jobs))) as ex:
+        for (_, _, done_msg, error_msg), error in zip(jobs, ex.map(copy, jobs)):
+            if error is None:
+                print(done_msg)
+                count += 1
+            elif not kwargs.get('suppress_error', False):
+                print(f"{error_msg}: {error}")
+    return count
+
+
+def open_noatime(path):
+    """Open a file for binary reading without updating its access time where supported"""
+    flags = os.O_RDONLY | getattr(os, 'O_NOATIME', 0)
+    try:
+        fd = os.open(path, flags)
+    except PermissionError:
+        # O_NOATIME is only allowed on files we own
+        fd = os.open(path, os.O_RDONLY)
+    return os.fdopen(fd, 'rb', buffering=1 << 20)
+
+
+def files_equal(path1, path2, st1=None, st2=None):
+    """Check whether two files have identical contents.
+    st1/st2 may pass stat results the caller already has; files of different
+    sizes are then told apart without touching either file.
+    Contents are compared block by block, stopping at the first difference."""
+    st1 = st1 or os.stat(path1)
+    st2 = st2 or os.stat(path2)
+    if (st1.st_dev, st1.st_ino) == (st2.st_dev, st2.st_ino):
+        return True  # hard links, or the same file reached through a bind mount
+    size = st1.st_size
+    if size != st2.st_size:
+        return False
+    if size == 0:
+        return True
+    block = 1 << 20
+    buf1 = bytearray(block)
+    buf2 = bytearray(block)
+    with open_noatime(path1) as f1, open_noatime(path2) as f2:
+        if hasattr(os, 'posix_fadvise'):
+            # Both files are read front to back: let the kernel read further ahead
+            for f in (f1, f2):
+                try:
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+                except OSError:
+                    pass
+        while True:
+            n1 = f1.readinto(buf1)
+            n2 = f2.readinto(buf2)
+            if n1 != n2:
+                return False
+            if n1 < block:
+                return buf1[:n1] == buf2[:n2]
+            if buf1 != buf2:
+                return False
+
+
+def compare_pairs(pairs):
+    """Compare each (local, shared[, local_stat, shared_stat]) pair with
+    files_equal on a thread pool, returning the results in order. Each worker
+    asks the kernel to start reading the pair it will most likely take next."""
+    workers = min(MAX_WORKERS, len(pairs)) or 1
+
+    def compare(i):
+        if i + workers < len(pairs):
+            upcoming = pairs[i + workers]
+            stats = upcoming[2:]
+            # no need to read ahead when the sizes already tell the files apart
+            if len(stats) < 2 or None in stats or stats[0].st_size == stats[1].st_size:
+                prefetch_file(upcoming[0])
+                prefetch_file(upcoming[1])
+        return files_equal(*pairs[i])
+
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        return list(ex.map(compare, range(len(pairs))))
+
+
+def prefetch_file(path):
+    """Ask the kernel to start reading a file into the page cache in the background"""
+    if not hasattr(os, 'posix_fadvise'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@functools.lru_cache(maxsize=4096)
 def parse_remote_path(path_str):
     """Parse 'user@host:/path' into (user, host, path)"""
-    import re
-    match = re.match(r'([^@]+)@([^:]+):(.*)', path_str)
-    if match:
-        return match.groups()
+    user, at, rest = path_str.partition('@')
+    host, colon, path = rest.partition(':')
+    if user and at and host and colon:
+        return user, host, path
     return None, None, path_str
 
 
@@ -218,7 +597,7 @@ def remote_file_exists(user, host, path):
     """Return True if remote file exists via SSH"""
     try:
         result = subprocess.run(
-            ['ssh', f'{user}@{host}', f'test -f "{path}" && echo 1 || echo 0'],
+            ['ssh', *ssh_options(), f'{user}@{host}', f'test -f "{path}" && echo 1 || echo 0'],
             capture_output=True, text=True)
         return result.stdout.strip() == '1'
     except Exception:
@@ -229,7 +608,7 @@ def get_remote_mtime(user, host, path):
     """Return remote file mtime as float, or None on failure"""
     try:
         result = subprocess.run(
-            ['ssh', f'{user}@{host}',
+            ['ssh', *ssh_options(), f'{user}@{host}',
              f'stat -c "%Y" "{path}" 2>/dev/null || stat -f "%m" "{path}"'],
             capture_output=True, text=True)
         return float(result.stdout.strip())
@@ -241,31 +620,132 @@ def list_remote_files(user, host, remote_root):
     """List all files under remote_root via SSH find; returns list of absolute remote paths"""
     try:
         result = subprocess.run(
-            ['ssh', f'{user}@{host}', f'find "{remote_root}" -type f'],
+            ['ssh', *ssh_options(), f'{user}@{host}', f'find "{remote_root}" -type f'],
             capture_output=True, text=True)
         return [line.strip() for line in result.stdout.splitlines() if line.strip()]
     except Exception:
         return []
 
 
+def list_remote_mtimes(user, host, remote_root):
+    """List all files under remote_root with their mtimes in one SSH call;
+    returns a list of (absolute remote path, mtime)"""
+    root = shlex.quote(remote_root)
+    script = (f"if stat -c %Y / >/dev/null 2>&1; "
+              f"then find {root} -type f -exec stat -c '%Y %n' {{}} +; "
+              f"else find {root} -type f -exec stat -f '%m %N' {{}} +; fi")
+    try:
+        result = subprocess.run(['ssh', *ssh_options(), f'{user}@{host}', script],
+                                capture_output=True, text=True)
+    except Exception:
+        return []
+    files = []
+    for line in result.stdout.splitlines():
+        mtime, _, path = line.partition(' ')
+        try:
+            files.append((path, float(mtime)))
+        except ValueError:
+            continue
+    return files
+
+
+def walk_scandir(root, relative='', ignore=None):
+    """Yield (DirEntry, relative path) for every file under root.
+    os.scandir reports each entry's type from the directory listing and
+    DirEntry caches its stat, so classifying entries costs no extra syscalls.
+    Like rglob, symlinked directories are not descended into.
+    ignore is a matcher from compile_ignores; matching files are skipped and
+    matching directories are pruned without being listed. Temporary files
+    left by an interrupted copy are skipped as well."""
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if ignore is not None and (ignore(entry.name) or ignore(entry.path)):
+                continue
+            entry_relative = os.path.join(relative, entry.name)
+            if entry.is_dir(follow_symlinks=False):
+                yield from walk_scandir(entry.path, entry_relative, ignore)
+            elif entry.is_file() and not entry.name.startswith(COPY_TEMP_PREFIX):
+                yield entry, entry_relative
+
+
+def scan_tree(root):
+    """Yield (relative path, mtime) for every file under a local root.
+    Uses a single streamed 'find -printf' where GNU find is available rather
+    than a stat per file from Python; falls back to walking the tree."""
+    root = str(root)
+    if sys.platform.startswith('linux'):
+        found = 0
+        try:
+            proc = subprocess.Popen(['find', root, '-xtype', 'f', '-printf', '%y %T@ %P\\0'],
+                                    stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+        except OSError:
+            proc = None
+        if proc is not None:
+            with proc:
+                pending = b''
+                for chunk in iter(lambda: proc.stdout.read(65536), b''):
+                    records = (pending + chunk).split(b'\0')
+                    pending = records.pop()
+                    for record in records:
+                        kind, mtime, rel = record.split(b' ', 2)
+                        rel = os.fsdecode(rel)
+                        if os.path.basename(rel).startswith(COPY_TEMP_PREFIX):
+                            continue
+                        if kind == b'l':
+                            # symlink to a file: use the target's mtime
+                            try:
+                                mtime = os.stat(os.path.join(root, rel)).st_mtime
+                            except OSError:
+                                continue
+                        yield rel, float(mtime)
+                        found += 1
+            # A find without -printf (e.g. busybox) fails without output
+            if found or proc.returncode == 0:
+                return
+    for entry, relative in walk_scandir(root):
+        try:
+            yield relative, entry.stat().st_mtime
+        except OSError:
+            continue
+
+
+PRIVATE_PREFIXES = ('._', '_', '~', '.', '#')
+
+
 def looks_like_private(name):
     """Check if filename looks like a private file"""
-    private_prefix = ['._', '_', '~', '.', '#']
-    return any(name.startswith(prefix) for prefix in private_prefix)
+    return name.startswith(PRIVATE_PREFIXES)
+
+
+@functools.lru_cache(maxsize=None)
+def compile_ignores(patterns):
+    """Compile a tuple of ignore patterns into a single regex match function.
+    Returns None when there is nothing to ignore."""
+    if not patterns:
+        return None
+    return re.compile('|'.join(fnmatch.translate(p) for p in patterns)).match
 
 
 def _read_shareignore(local_dir):
     """Read .shareignore patterns from a local directory"""
-    shareignore = Path(local_dir) / '.shareignore'
-    if not shareignore.exists():
-        return []
-    patterns = []
+    shareignore = os.path.join(local_dir, '.shareignore')
+    try:
+        mtime_ns = os.stat(shareignore).st_mtime_ns
+    except OSError:
+        return ()
+    return _parse_shareignore(shareignore, mtime_ns)
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_shareignore(shareignore, mtime_ns):
+    """Parse a .shareignore file; mtime_ns is part of the cache key so edits are picked up"""
     with open(shareignore) as f:
-        for line in f:
-            p = line.split('#', 1)[0].strip()
-            if p:
-                patterns.append(p.lstrip('/'))
-    return patterns
+        lines = [line.split('#', 1)[0].strip() for line in f]
+    return tuple(p.lstrip('/') for p in lines if p)
 
 
 def _list_shared_children(shared_path):
@@ -275,7 +755,7 @@ def _list_shared_children(shared_path):
         user, host, remote_path = parse_remote_path(shared_path)
         try:
             result = subprocess.run(
-                ['ssh', f'{user}@{host}',
+                ['ssh', *ssh_options(), f'{user}@{host}',
                  f'find "{remote_path}" -maxdepth 1 -mindepth 1 \\( -type f -o -type d \\) 2>/dev/null'
                  f' | while IFS= read -r p; do n=$(basename "$p");'
                  f' [ -d "$p" ] && echo "d $n" || echo "f $n"; done'],
@@ -306,74 +786,80 @@ def recursive_apply(func, path, skip_private=True, **kwargs):
       remote), so commands like 'get'/'pull' work on directories not yet present
       locally.
     - func is called only for leaf paths (files or unresolvable non-dirs).
+
+    The tree is walked depth-first with an explicit stack, in the same order
+    a recursive descent would visit it, so deep trees cannot hit the
+    recursion limit. Local directories are listed with os.scandir, whose
+    entries already know whether they are files or directories.
     """
-    p = Path(path)
-    ignore_patterns = list(kwargs.get('ignore_patterns', []))
-    print_prefix = kwargs.get('print_prefix', '')
-    new_prefix = print_prefix + '  '
-
-    def is_ignored(name, full_path):
-        return any(
-            fnmatch.fnmatch(name, pat) or fnmatch.fnmatch(str(full_path), pat)
-            for pat in ignore_patterns
-        )
-
-    if p.is_dir():
-        local_patterns = _read_shareignore(p)
-        child_kwargs = dict(kwargs,
-                            ignore_patterns=ignore_patterns + local_patterns,
-                            print_prefix=new_prefix)
-        res = 0
-        for sub in p.iterdir():
-            if is_ignored(sub.name, sub):
+    res = 0
+    # Stack entries: (path, kwargs for it, ignore matcher of its parent,
+    # 'dir'/'file' when known from the parent's listing). The matcher is
+    # False for the starting path, which is never filtered, and None when
+    # nothing is ignored. Children are pushed in reverse so they are popped
+    # in listing order.
+    stack = [(path, kwargs, False, None)]
+    while stack:
+        path, kw, parent_match, kind = stack.pop()
+        p = Path(path)
+        if parent_match is not False:
+            if parent_match is not None and (parent_match(p.name) is not None
+                                             or parent_match(str(p)) is not None):
                 continue
-            if skip_private and looks_like_private(sub.name):
-                if not kwargs.get('suppress_extra', False):
-                    print(f"{new_prefix}⚠ {sub} looks like private; skipping.")
+            if skip_private and looks_like_private(p.name):
+                if not kw.get('suppress_extra', False):
+                    locked_print(f"{kw.get('print_prefix', '')}⚠ {p} looks like private; skipping.")
                 continue
-            res += recursive_apply(func, sub, skip_private, **child_kwargs)
-        return res
-
-    elif not p.exists():
-        shared_root = kwargs.get('shared_root', SHARED_ROOT)
-        shared_path = get_shared_path(path, shared_root)
-        if shared_path is not None:
-            children = _list_shared_children(shared_path)
+
+        ignore_patterns = list(kw.get('ignore_patterns', []))
+        new_prefix = kw.get('print_prefix', '') + '  '
+        ignore_match = compile_ignores(tuple(ignore_patterns))
+
+        if kind == 'file':
+            res += func(p, **kw)
+
+        elif kind == 'dir' or p.is_dir():
+            local_patterns = _read_shareignore(p)
+            child_kwargs = dict(kw,
+                                ignore_patterns=ignore_patterns + list(local_patterns),
+                                print_prefix=new_prefix)
+            with os.scandir(p) as it:
+                children = [(Path(e.path), 'dir' if e.is_dir() else 'file' if e.is_file() else None)
+                            for e in it]
+            stack.extend((c, child_kwargs, ignore_match, k) for c, k in reversed(children))
+
+        elif not p.exists():
+            shared_root = kw.get('shared_root', SHARED_ROOT)
+            shared_path = get_shared_path(path, shared_root)
+            children = _list_shared_children(shared_path) if shared_path is not None else []
             if children:
                 # suppress per-file errors when traversing from shared side
-                child_kwargs = dict(kwargs, print_prefix=new_prefix,
-                                    suppress_error=kwargs.get('suppress_error', True))
-                res = 0
-                for name, _ in children:
-                    child_local = p / name
-                    if is_ignored(name, child_local):
-                        continue
-                    if skip_private and looks_like_private(name):
-                        if not kwargs.get('suppress_extra', False):
-                            print(f"{new_prefix}⚠ {child_local} looks like private; skipping.")
-                        continue
-                    res += recursive_apply(func, child_local, skip_private, **child_kwargs)
-                return res
-        return func(p, **kwargs)
+                child_kwargs = dict(kw, print_prefix=new_prefix,
+                                    suppress_error=kw.get('suppress_error', True))
+                stack.extend((p / name, child_kwargs, ignore_match, None)
+                             for name, _ in reversed(children))
+            else:
+                res += func(p, **kw)
 
-    else:
-        return func(p, **kwargs)
+        else:
+            res += func(p, **kw)
+    return res
     
 
 def create_file_that_looks_like_created_on_epoch(path, **kwargs):
     """Create a file with modification time set to epoch (Jan 1, 1970)"""
     p = Path(path)
-    p.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(os.path.dirname(p))
     # Print message if exists but not epoch time
     if p.exists():
         mtime = p.stat().st_mtime
         if not file_is_newer(mtime, 1):  # if mtime is not newer than epoch
             if not kwargs.get('suppress_extra', False):
-                print(f"{kwargs.get('print_prefix', '')}File already looks like created on epoch, skipping: {path}")
+                locked_print(f"{kwargs.get('print_prefix', '')}File already looks like created on epoch, skipping: {path}")
             return
         else:
             if not kwargs.get('suppress_extra', False):
-                print(f"{kwargs.get('print_prefix', '')}File already exists with non-epoch time, skipping: {path}")
+                locked_print(f"{kwargs.get('print_prefix', '')}File already exists with non-epoch time, skipping: {path}")
             return
     p.touch()
     epoch_time = 0
@@ -388,14 +874,14 @@ def cmd_ask(local_file, **kwargs):
     if shared_path is None:
         return 1
     if isinstance(shared_path, Path):
-        shared_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_dir(os.path.dirname(shared_path))
     try:
         create_file_that_looks_like_created_on_epoch(shared_path, **kwargs)
     except Exception as e:
         if not kwargs.get('suppress_error', False):
-            print(f"{print_prefix}Error: Failed to create ask file in shared: {e}")
+            locked_print(f"{print_prefix}Error: Failed to create ask file in shared: {e}")
         return 1
-    print(f"{print_prefix}✓ Asked for sharing: {local_file} (created ask file in shared)")
+    locked_print(f"{print_prefix}✓ Asked for sharing: {local_file} (created ask file in shared)")
     return 0
 
 
@@ -404,24 +890,28 @@ def cmd_put(local_file, **kwargs):
     local_path = Path(local_file)
     print_prefix = kwargs.get('print_prefix', '')
     shared_root = kwargs.get('shared_root', SHARED_ROOT)
-    if not file_exists_and_valid(local_path):
+    local_stat = stat_if_exists(local_path)
+    if local_stat is None or not stat.S_ISREG(local_stat.st_mode):
         if not kwargs.get('suppress_error', False):
-            print(f"{print_prefix}Error: Local file does not exist: {local_file}")
+            locked_print(f"{print_prefix}Error: Local file does not exist: {local_file}")
         return 1
 
     shared_path = get_shared_path(local_file, shared_root)
     if shared_path is None:
         return 1
     if isinstance(shared_path, Path):
-        shared_path.parent.mkdir(parents=True, exist_ok=True)
+        if same_fingerprint(local_stat, stat_if_exists(shared_path)):
+            locked_print(f"{print_prefix}✓ Put: {local_file} → {shared_path} (already identical)")
+            return 0
+        ensure_dir(os.path.dirname(shared_path))
 
     try:
         file_copy(local_path, shared_path, **kwargs)
     except Exception as e:
         if not kwargs.get('suppress_error', False):
-            print(f"{print_prefix}Error: Failed to put {local_file} to shared: {e}")
+            locked_print(f"{print_prefix}Error: Failed to put {local_file} to shared: {e}")
         return 1
-    print(f"{print_prefix}✓ Put: {local_file} → {shared_path}")
+    locked_print(f"{print_prefix}✓ Put: {local_file} → {shared_path}")
     return 0
 
 
@@ -430,17 +920,16 @@ def cmd_push(local_file, **kwargs):
     print_prefix = kwargs.get('print_prefix', '')
     shared_root = kwargs.get('shared_root', SHARED_ROOT)
     local_path = Path(local_file)
-    if not file_exists_and_valid(local_path):
+    local_mtime = regular_file_mtime(local_path)
+    if local_mtime is None:
         if not kwargs.get('suppress_error', False):
-            print(f"{print_prefix}Error: Local file does not exist: {local_file}")
+            locked_print(f"{print_prefix}Error: Local file does not exist: {local_file}")
         return 1
 
     shared_path = get_shared_path(local_file, shared_root)
     if shared_path is None:
         return 1
 
-    local_mtime = local_path.stat().st_mtime
-
     if isinstance(shared_path, str):
         # Remote path: use SSH to check existence and mtime
         user, host, path = parse_remote_path(shared_path)
@@ -449,43 +938,56 @@ def cmd_push(local_file, **kwargs):
             remote_mtime = get_remote_mtime(user, host, path)
             if remote_mtime is not None and not file_is_newer(local_mtime, remote_mtime):
                 if not kwargs.get('suppress_extra', False):
-                    print(f"{print_prefix}⊘ Not pushed: {local_file} (shared is newer or same)")
+                    locked_print(f"{print_prefix}⊘ Not pushed: {local_file} (shared is newer or same)")
                 return 0
         label = "(new)" if not exists else "(local newer)"
         try:
             file_copy(local_path, shared_path, **kwargs)
         except Exception as e:
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Failed to push {local_file} to shared: {e}")
+                locked_print(f"{print_prefix}Error: Failed to push {local_file} to shared: {e}")
             return 1
-        print(f"{print_prefix}✓ Pushed: {local_file} → {shared_path} {label}")
+        locked_print(f"{print_prefix}✓ Pushed: {local_file} → {shared_path} {label}")
         return 0
 
-    # Local shared path
-    if not shared_path.exists():
-        shared_path.parent.mkdir(parents=True, exist_ok=True)
+    # Local shared path: one stat answers both existence and mtime
+    shared_stat = stat_if_exists(shared_path)
+    if shared_stat is None:
+        ensure_dir(os.path.dirname(shared_path))
         try:
             file_copy(local_path, shared_path, **kwargs)
         except Exception as e:
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Failed to push {local_file} to shared: {e}")
+                locked_print(f"{print_prefix}Error: Failed to push {local_file} to shared: {e}")
             return 1
-        print(f"{print_prefix}✓ Pushed: {local_file} → {shared_path} (new)")
+        locked_print(f"{print_prefix}✓ Pushed: {local_file} → {shared_path} (new)")
         return 0
 
-    shared_mtime = shared_path.stat().st_mtime
-    if file_is_newer(local_mtime, shared_mtime):
+    if file_is_newer(local_mtime, shared_stat.st_mtime):
+        # Identical content only needs the newer timestamp, not another copy.
+        # Preview touches nothing, and a shared path that cannot be read (say a
+        # directory in the way) counts as changed, leaving the copy to report it.
+        unchanged = False
+        if not kwargs.get('preview', False):
+            try:
+                unchanged = files_equal(local_path, shared_path, st2=shared_stat)
+            except OSError:
+                pass
         try:
-            file_copy(local_path, shared_path, **kwargs)
+            if not unchanged:
+                file_copy(local_path, shared_path, **kwargs)
+            elif not kwargs.get('preview', False):
+                shutil.copystat(local_path, shared_path)
         except Exception as e:
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Failed to push {local_file} to shared: {e}")
+                locked_print(f"{print_prefix}Error: Failed to push {local_file} to shared: {e}")
             return 1
-        print(f"{print_prefix}✓ Pushed: {local_file} (local newer)")
+        label = "(local newer, content unchanged)" if unchanged else "(local newer)"
+        locked_print(f"{print_prefix}✓ Pushed: {local_file} {label}")
         return 0
     else:
         if not kwargs.get('suppress_extra', False):
-            print(f"{print_prefix}⊘ Not pushed: {local_file} (shared is newer or same)")
+            locked_print(f"{print_prefix}⊘ Not pushed: {local_file} (shared is newer or same)")
         return 0
     
 
@@ -498,78 +1000,35 @@ def cmd_push_all(**kwargs):
             print(f"{print_prefix}Error: SHARE_PATH is not set. Cannot push all.")
         return 1
 
+    jobs = []
     if isinstance(shared_root, str):
         # Remote shared root: list remote files, push local→remote if local is newer
         user, host, remote_root = parse_remote_path(shared_root)
-        remote_files = list_remote_files(user, host, remote_root)
-        count = 0
-        for remote_file_path in remote_files:
+        for remote_file_path, remote_mtime in list_remote_mtimes(user, host, remote_root):
             if not remote_file_path.startswith(remote_root):
                 continue
             rel = remote_file_path[len(remote_root):].lstrip('/')
             local_file = SHARE_PATH / rel
-            if not file_exists_and_valid(local_file):
+            local_mtime = regular_file_mtime(local_file)
+            if local_mtime is None or local_mtime - remote_mtime <= MTIME_TOLERANCE:
                 continue
-            local_mtime = local_file.stat().st_mtime
-            remote_mtime = get_remote_mtime(user, host, remote_file_path)
             shared_str = f"{user}@{host}:{remote_file_path}"
-            if remote_mtime is not None and not file_is_newer(local_mtime, remote_mtime):
-                continue
-            try:
-                file_copy(local_file, shared_str, **kwargs)
-            except Exception as e:
-                if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to push {local_file} to shared: {e}")
-                continue
-            label = "(new)" if remote_mtime is None else "(local newer)"
-            print(f"{print_prefix}✓ Pushed: {local_file} → {shared_str} {label}")
-            count += 1
-        if count == 0:
-            print(f"{print_prefix}✓ Already up to date")
-        else:
-            print(f"{print_prefix}✓ Pushed {count} files")
-        return 0
-
-    count = 0
-
-    for remote_file in shared_root.rglob('*'):
-        if not remote_file.is_file():
-            continue
-        local_path = Path(remote_file)
-        # Reconstruct local path
-        relative = local_path.relative_to(shared_root)
-        local_file = SHARE_PATH / relative
-        local_path = Path(local_file)
-
-        if not file_exists_and_valid(local_path):
-            continue
+            jobs.append((local_file, shared_str,
+                         f"{print_prefix}✓ Pushed: {local_file} → {shared_str} (local newer)",
+                         f"{print_prefix}Error: Failed to push {local_file} to shared"))
+    else:
+        for relative, shared_mtime in scan_tree(shared_root):
+            local_file = SHARE_PATH / relative
+            remote_file = shared_root / relative
 
-        # If shared doesn't exist, always push
-        if not remote_file.exists():
-            remote_file.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                file_copy(local_path, remote_file, **kwargs)
-            except Exception as e:
-                if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to push {local_file} to shared: {e}")
-                continue
-            print(f"{print_prefix}✓ Pushed: {local_file} → {remote_file} (new)")
-            count += 1
-            continue
+            # Compare modification times
+            local_mtime = regular_file_mtime(local_file)
+            if local_mtime is not None and local_mtime - shared_mtime > MTIME_TOLERANCE:
+                jobs.append((local_file, remote_file,
+                             f"{print_prefix}✓ Pushed: {local_file} (local newer)",
+                             f"{print_prefix}Error: Failed to push {local_file} to shared"))
 
-        # Compare modification times
-        local_mtime = local_path.stat().st_mtime
-        shared_mtime = remote_file.stat().st_mtime
-        if file_is_newer(local_mtime, shared_mtime):
-            try:
-                file_copy(local_path, remote_file, **kwargs)
-            except Exception as e:
-                if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to push {local_file} to shared: {e}")
-                continue
-            print(f"{print_prefix}✓ Pushed: {local_file} (local newer)")
-            count += 1
-        
+    count = run_copies(jobs, **kwargs)
     if count == 0:
         print(f"{print_prefix}✓ Already up to date")
     else:
@@ -590,21 +1049,26 @@ def cmd_get(local_file, **kwargs):
         user, host, path = parse_remote_path(shared_path)
         if not remote_file_exists(user, host, path):
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: File not shared: {local_file}")
+                locked_print(f"{print_prefix}Error: File not shared: {local_file}")
             return 1
-    elif not shared_path.exists():
-        if not kwargs.get('suppress_error', False):
-            print(f"{print_prefix}Error: File not shared: {local_file}")
-        return 1
+    else:
+        shared_stat = stat_if_exists(shared_path)
+        if shared_stat is None:
+            if not kwargs.get('suppress_error', False):
+                locked_print(f"{print_prefix}Error: File not shared: {local_file}")
+            return 1
+        if same_fingerprint(shared_stat, stat_if_exists(local_path)):
+            locked_print(f"{print_prefix}✓ Got: {shared_path} → {local_file} (already identical)")
+            return 0
 
-    local_path.parent.mkdir(parents=True, exist_ok=True)
+    ensure_dir(os.path.dirname(local_path))
     try:
         file_copy(shared_path, local_path, **kwargs)
     except Exception as e:
         if not kwargs.get('suppress_error', False):
-            print(f"Error: Failed to get {local_file} from shared: {e}")
+            locked_print(f"Error: Failed to get {local_file} from shared: {e}")
         return 1
-    print(f"{print_prefix}✓ Got: {shared_path} → {local_file}")
+    locked_print(f"{print_prefix}✓ Got: {shared_path} → {local_file}")
     return 0
 
 
@@ -622,67 +1086,71 @@ def cmd_pull(local_file, **kwargs):
         user, host, path = parse_remote_path(shared_path)
         if not remote_file_exists(user, host, path):
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: File not shared: {local_file}")
+                locked_print(f"{print_prefix}Error: File not shared: {local_file}")
             return 1
-        if not local_path.exists():
-            local_path.parent.mkdir(parents=True, exist_ok=True)
+        local_stat = stat_if_exists(local_path)
+        if local_stat is None:
+            ensure_dir(os.path.dirname(local_path))
             try:
                 file_copy(shared_path, local_path, **kwargs)
             except Exception as e:
                 if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
+                    locked_print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
                 return 1
-            print(f"{print_prefix}✓ Pulled: {local_file} (new locally)")
+            locked_print(f"{print_prefix}✓ Pulled: {local_file} (new locally)")
             return 0
-        local_mtime = local_path.stat().st_mtime
+        local_mtime = local_stat.st_mtime
         remote_mtime = get_remote_mtime(user, host, path)
         if remote_mtime is None or file_is_newer(remote_mtime, local_mtime):
             try:
                 file_copy(shared_path, local_path, **kwargs)
             except Exception as e:
                 if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
+                    locked_print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
                 return 1
-            print(f"{print_prefix}✓ Pulled: {local_file} (shared newer)")
+            locked_print(f"{print_prefix}✓ Pulled: {local_file} (shared newer)")
             return 0
         else:
             if not kwargs.get('suppress_extra', False):
-                print(f"{print_prefix}⊘ Not pulled: {local_file} (local is newer or same)")
+                locked_print(f"{print_prefix}⊘ Not pulled: {local_file} (local is newer or same)")
             return 0
 
-    if not shared_path.exists():
+    # Stat each side once and reuse the result for existence and mtime
+    shared_stat = stat_if_exists(shared_path)
+    if shared_stat is None:
         if not kwargs.get('suppress_error', False):
-            print(f"{print_prefix}Error: File not shared: {local_file}")
+            locked_print(f"{print_prefix}Error: File not shared: {local_file}")
         return 1
 
     # If local doesn't exist, always pull
-    if not local_path.exists():
-        local_path.parent.mkdir(parents=True, exist_ok=True)
+    local_stat = stat_if_exists(local_path)
+    if local_stat is None:
+        ensure_dir(os.path.dirname(local_path))
         try:
             file_copy(shared_path, local_path, **kwargs)
         except Exception as e:
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
+                locked_print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
             return 1
-        print(f"{print_prefix}✓ Pulled: {local_file} (new locally)")
+        locked_print(f"{print_prefix}✓ Pulled: {local_file} (new locally)")
         return 0
 
     # Compare modification times
-    local_mtime = local_path.stat().st_mtime
-    shared_mtime = shared_path.stat().st_mtime
+    local_mtime = local_stat.st_mtime
+    shared_mtime = shared_stat.st_mtime
 
     if file_is_newer(shared_mtime, local_mtime):
         try:
             file_copy(shared_path, local_path, **kwargs)
         except Exception as e:
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
+                locked_print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
             return 1
-        print(f"{print_prefix}✓ Pulled: {local_file} (shared newer)")
+        locked_print(f"{print_prefix}✓ Pulled: {local_file} (shared newer)")
         return 0
     else:
         if not kwargs.get('suppress_extra', False):
-            print(f"{print_prefix}⊘ Not pulled: {local_file} (local is newer or same)")
+            locked_print(f"{print_prefix}⊘ Not pulled: {local_file} (local is newer or same)")
         return 0
     
 
@@ -695,86 +1163,54 @@ def cmd_pull_all(**kwargs):
             print(f"{print_prefix}Error: SHARE_PATH is not set. Cannot pull all.")
         return 1
 
+    jobs = []
     if isinstance(shared_root, str):
         # Remote shared root: list remote files, pull remote→local if remote is newer
         user, host, remote_root = parse_remote_path(shared_root)
-        remote_files = list_remote_files(user, host, remote_root)
-        count = 0
-        for remote_file_path in remote_files:
+        for remote_file_path, remote_mtime in list_remote_mtimes(user, host, remote_root):
             if not remote_file_path.startswith(remote_root):
                 continue
             rel = remote_file_path[len(remote_root):].lstrip('/')
             local_file = SHARE_PATH / rel
             shared_str = f"{user}@{host}:{remote_file_path}"
-            if not local_file.exists():
-                local_file.parent.mkdir(parents=True, exist_ok=True)
-                try:
-                    file_copy(shared_str, local_file, **kwargs)
-                except Exception as e:
-                    if not kwargs.get('suppress_error', False):
-                        print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
-                    continue
-                print(f"{print_prefix}✓ Pulled: {local_file} (new locally)")
-                count += 1
-                continue
-            local_mtime = local_file.stat().st_mtime
-            remote_mtime = get_remote_mtime(user, host, remote_file_path)
-            if remote_mtime is None or file_is_newer(remote_mtime, local_mtime):
-                try:
-                    file_copy(shared_str, local_file, **kwargs)
-                except Exception as e:
-                    if not kwargs.get('suppress_error', False):
-                        print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
-                    continue
-                print(f"{print_prefix}✓ Pulled: {local_file} (shared newer)")
-                count += 1
-        if count == 0:
-            if not kwargs.get('suppress_extra', False):
-                print(f"{print_prefix}✓ Already up to date")
-        else:
-            print(f"{print_prefix}✓ Pulled {count} files")
-        return 0
-
-    count = 0
-
-    for shared_file in shared_root.rglob('*'):
-        if not shared_file.is_file():
-            continue
-        shared_path = Path(shared_file)
-        # Reconstruct local path
-        relative = shared_path.relative_to(shared_root)
-        if SHARE_PATH:
-            local_file = SHARE_PATH / relative
-        else:
-            local_file = Path(relative)
-        local_path = Path(local_file)
-
-        # If local doesn't exist, always pull
-        if not local_path.exists():
-            local_path.parent.mkdir(parents=True, exist_ok=True)
             try:
-                file_copy(shared_path, local_path, **kwargs)
-            except Exception as e:
-                if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
+                local_mtime = local_file.stat().st_mtime
+            except (FileNotFoundError, NotADirectoryError):
+                local_mtime = None
+            if local_mtime is None:
+                ensure_dir(os.path.dirname(local_file))
+                jobs.append((shared_str, local_file,
+                             f"{print_prefix}✓ Pulled: {local_file} (new locally)",
+                             f"{print_prefix}Error: Failed to pull {local_file} from shared"))
                 continue
-            print(f"{print_prefix}✓ Pulled: {local_file} (new locally)")
-            count += 1
-            continue
+            if remote_mtime - local_mtime > MTIME_TOLERANCE:
+                jobs.append((shared_str, local_file,
+                             f"{print_prefix}✓ Pulled: {local_file} (shared newer)",
+                             f"{print_prefix}Error: Failed to pull {local_file} from shared"))
+    else:
+        for relative, shared_mtime in scan_tree(shared_root):
+            shared_path = shared_root / relative
+            local_path = SHARE_PATH / relative
 
-        # Compare modification times
-        local_mtime = local_path.stat().st_mtime
-        shared_mtime = shared_path.stat().st_mtime
-        if file_is_newer(shared_mtime, local_mtime):
+            # If local doesn't exist, always pull
             try:
-                file_copy(shared_path, local_path, **kwargs)
-            except Exception as e:
-                if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to pull {local_file} from shared: {e}")
+                local_mtime = local_path.stat().st_mtime
+            except (FileNotFoundError, NotADirectoryError):
+                local_mtime = None
+            if local_mtime is None:
+                ensure_dir(os.path.dirname(local_path))
+                jobs.append((shared_path, local_path,
+                             f"{print_prefix}✓ Pulled: {local_path} (new locally)",
+                             f"{print_prefix}Error: Failed to pull {local_path} from shared"))
                 continue
-            print(f"{print_prefix}✓ Pulled: {local_file} (shared newer)")
-            count += 1
 
+            # Compare modification times
+            if shared_mtime - local_mtime > MTIME_TOLERANCE:
+                jobs.append((shared_path, local_path,
+                             f"{print_prefix}✓ Pulled: {local_path} (shared newer)",
+                             f"{print_prefix}Error: Failed to pull {local_path} from shared"))
+
+    count = run_copies(jobs, **kwargs)
     if count == 0:
         if not kwargs.get('suppress_extra', False):
             print(f"{print_prefix}✓ Already up to date")
@@ -793,46 +1229,48 @@ def cmd_sync(local_file, **kwargs):
     if shared_path is None:
         return 1
 
-    local_exists = file_exists_and_valid(local_path)
+    local_mtime = regular_file_mtime(local_path)
+    local_exists = local_mtime is not None
     is_remote = isinstance(shared_path, str)
     if is_remote:
         r_user, r_host, r_path = parse_remote_path(shared_path)
         shared_exists = remote_file_exists(r_user, r_host, r_path)
     else:
-        shared_exists = shared_path.exists()
+        # One stat for both existence and, later, the mtime
+        shared_stat = stat_if_exists(shared_path)
+        shared_exists = shared_stat is not None
 
     # If neither exists, error
     if not local_exists and not shared_exists:
         if not kwargs.get('suppress_error', False):
-            print(f"{print_prefix}Error: File exists in neither location: {local_file}")
+            locked_print(f"{print_prefix}Error: File exists in neither location: {local_file}")
         return 1
 
     # If only one exists, copy to the other
     if not shared_exists:
         if isinstance(shared_path, Path):
-            shared_path.parent.mkdir(parents=True, exist_ok=True)
+            ensure_dir(os.path.dirname(shared_path))
         try:
             file_copy(local_path, shared_path, **kwargs)
         except Exception as e:
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Failed to sync {local_file} to shared: {e}")
+                locked_print(f"{print_prefix}Error: Failed to sync {local_file} to shared: {e}")
             return 1
-        print(f"{print_prefix}✓ Synced: {local_file} → shared (new)")
+        locked_print(f"{print_prefix}✓ Synced: {local_file} → shared (new)")
         return 0
 
     if not local_exists:
-        local_path.parent.mkdir(parents=True, exist_ok=True)
+        ensure_dir(os.path.dirname(local_path))
         try:
             file_copy(shared_path, local_path, **kwargs)
         except Exception as e:
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Failed to sync {local_file} from shared: {e}")
+                locked_print(f"{print_prefix}Error: Failed to sync {local_file} from shared: {e}")
             return 1
-        print(f"{print_prefix}✓ Synced: shared → {local_file} (new)")
+        locked_print(f"{print_prefix}✓ Synced: shared → {local_file} (new)")
         return 0
 
     # Both exist, compare times
-    local_mtime = local_path.stat().st_mtime
     if is_remote:
         shared_mtime = get_remote_mtime(r_user, r_host, r_path)
         if shared_mtime is None:
@@ -841,34 +1279,34 @@ def cmd_sync(local_file, **kwargs):
                 file_copy(local_path, shared_path, **kwargs)
             except Exception as e:
                 if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to sync {local_file} to shared: {e}")
+                    locked_print(f"{print_prefix}Error: Failed to sync {local_file} to shared: {e}")
                 return 1
-            print(f"{print_prefix}✓ Synced: {local_file} → shared (local newer)")
+            locked_print(f"{print_prefix}✓ Synced: {local_file} → shared (local newer)")
             return 0
     else:
-        shared_mtime = shared_path.stat().st_mtime
+        shared_mtime = shared_stat.st_mtime
 
     if file_is_newer(local_mtime, shared_mtime):
         try:
             file_copy(local_path, shared_path, **kwargs)
         except Exception as e:
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Failed to sync {local_file} to shared: {e}")
+                locked_print(f"{print_prefix}Error: Failed to sync {local_file} to shared: {e}")
             return 1
-        print(f"{print_prefix}✓ Synced: {local_file} → shared (local newer)")
+        locked_print(f"{print_prefix}✓ Synced: {local_file} → shared (local newer)")
         return 0
     elif file_is_newer(shared_mtime, local_mtime):
         try:
             file_copy(shared_path, local_path, **kwargs)
         except Exception as e:
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Failed to sync {local_file} from shared: {e}")
+                locked_print(f"{print_prefix}Error: Failed to sync {local_file} from shared: {e}")
             return 1
-        print(f"{print_prefix}✓ Synced: shared → {local_file} (shared newer)")
+        locked_print(f"{print_prefix}✓ Synced: shared → {local_file} (shared newer)")
         return 0
     else:
         if not kwargs.get('suppress_extra', False):
-            print(f"{print_prefix}✓ Already synced: {local_file}")
+            locked_print(f"{print_prefix}✓ Already synced: {local_file}")
         return 0
 
 
@@ -881,144 +1319,73 @@ def cmd_sync_all(**kwargs):
             print(f"{print_prefix}Error: SHARE_PATH is not set. Cannot sync all.")
         return 1
 
+    jobs = []
     if isinstance(shared_root, str):
         # Remote shared root: sync files from both sides
         user, host, remote_root = parse_remote_path(shared_root)
-        remote_files = list_remote_files(user, host, remote_root)
         remote_rel_set = set()
-        count = 0
         # Pull/sync remote→local for files that exist in remote
-        for remote_file_path in remote_files:
+        for remote_file_path, remote_mtime in list_remote_mtimes(user, host, remote_root):
             if not remote_file_path.startswith(remote_root):
                 continue
             rel = remote_file_path[len(remote_root):].lstrip('/')
             remote_rel_set.add(rel)
             local_file = SHARE_PATH / rel
             shared_str = f"{user}@{host}:{remote_file_path}"
-            local_exists = file_exists_and_valid(local_file)
-            if not local_exists:
-                local_file.parent.mkdir(parents=True, exist_ok=True)
-                try:
-                    file_copy(shared_str, local_file, **kwargs)
-                except Exception as e:
-                    if not kwargs.get('suppress_error', False):
-                        print(f"{print_prefix}Error: Failed to sync {local_file} from shared: {e}")
-                    continue
-                print(f"{print_prefix}✓ Synced: shared → {local_file} (new)")
-                count += 1
+            local_mtime = regular_file_mtime(local_file)
+            if local_mtime is None:
+                ensure_dir(os.path.dirname(local_file))
+                jobs.append((shared_str, local_file,
+                             f"{print_prefix}✓ Synced: shared → {local_file} (new)",
+                             f"{print_prefix}Error: Failed to sync {local_file} from shared"))
                 continue
-            local_mtime = local_file.stat().st_mtime
-            remote_mtime = get_remote_mtime(user, host, remote_file_path)
-            if remote_mtime is None or file_is_newer(local_mtime, remote_mtime):
-                try:
-                    file_copy(local_file, shared_str, **kwargs)
-                except Exception as e:
-                    if not kwargs.get('suppress_error', False):
-                        print(f"{print_prefix}Error: Failed to sync {local_file} to shared: {e}")
-                    continue
-                print(f"{print_prefix}✓ Synced: {local_file} → shared (local newer)")
-                count += 1
-            elif file_is_newer(remote_mtime, local_mtime):
-                try:
-                    file_copy(shared_str, local_file, **kwargs)
-                except Exception as e:
-                    if not kwargs.get('suppress_error', False):
-                        print(f"{print_prefix}Error: Failed to sync {local_file} from shared: {e}")
-                    continue
-                print(f"{print_prefix}✓ Synced: shared → {local_file} (shared newer)")
-                count += 1
+            delta = local_mtime - remote_mtime
+            if delta > MTIME_TOLERANCE:
+                jobs.append((local_file, shared_str,
+                             f"{print_prefix}✓ Synced: {local_file} → shared (local newer)",
+                             f"{print_prefix}Error: Failed to sync {local_file} to shared"))
+            elif delta < -MTIME_TOLERANCE:
+                jobs.append((shared_str, local_file,
+                             f"{print_prefix}✓ Synced: shared → {local_file} (shared newer)",
+                             f"{print_prefix}Error: Failed to sync {local_file} from shared"))
         # Push local→remote for files only in local (not yet in remote)
-        for local_file in SHARE_PATH.rglob('*'):
-            if not local_file.is_file():
-                continue
-            rel = str(local_file.relative_to(SHARE_PATH))
+        ignore = compile_ignores(tuple(kwargs.get('ignore_patterns', [])))
+        for entry, rel in walk_scandir(SHARE_PATH, ignore=ignore):
             if rel in remote_rel_set:
                 continue
+            local_file = Path(entry.path)
             remote_file_path = f"{remote_root}/{rel}"
             shared_str = f"{user}@{host}:{remote_file_path}"
-            try:
-                file_copy(local_file, shared_str, **kwargs)
-            except Exception as e:
-                if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to sync {local_file} to shared: {e}")
-                continue
-            print(f"{print_prefix}✓ Synced: {local_file} → shared (new)")
-            count += 1
-        if count == 0:
-            if not kwargs.get('suppress_extra', False):
-                print(f"{print_prefix}✓ Already up to date")
-        else:
-            print(f"{print_prefix}✓ Synced {count} files")
-        return 0
-
-    count = 0
-
-    # Walk through shared directory
-    for shared_file in shared_root.rglob('*'):
-        if not shared_file.is_file():
-            continue
-
-        # Reconstruct local path
-        relative = shared_file.relative_to(shared_root)
-        if SHARE_PATH:
-            local_file = SHARE_PATH / relative
-        else:
-            local_file = Path(relative)
-        local_path = Path(local_file)
-        shared_path = Path(shared_file)
-
-        local_exists = file_exists_and_valid(local_path)
-        shared_exists = shared_path.exists()
-
-        # If only one exists, copy to the other
-        if not local_exists:
-            local_path.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                file_copy(shared_path, local_path, **kwargs)
-            except Exception as e:
-                if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to sync {local_file} from shared: {e}")
-                continue
-            print(f"{print_prefix}✓ Synced: shared → {local_file} (new)")
-            count += 1
-            continue
-
-        if not shared_exists:
-            if isinstance(shared_path, Path):
-                shared_path.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                file_copy(local_path, shared_path, **kwargs)
-            except Exception as e:
-                if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to sync {local_file} to shared: {e}")
-                continue
-            print(f"{print_prefix}✓ Synced: {local_file} → shared (new)")
-            count += 1
-            continue
-
-        # Both exist, compare times
-        local_mtime = local_path.stat().st_mtime
-        shared_mtime = shared_path.stat().st_mtime
-
-        if file_is_newer(local_mtime, shared_mtime):
-            try:
-                file_copy(local_path, shared_path, **kwargs)
-            except Exception as e:
-                if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to sync {local_file} to shared: {e}")
-                continue
-            print(f"{print_prefix}✓ Synced: {local_file} → shared (local newer)")
-            count += 1
-        elif file_is_newer(shared_mtime, local_mtime):
-            try:
-                file_copy(shared_path, local_path, **kwargs)
-            except Exception as e:
-                if not kwargs.get('suppress_error', False):
-                    print(f"{print_prefix}Error: Failed to sync {local_file} from shared: {e}")
+            jobs.append((local_file, shared_str,
+                         f"{print_prefix}✓ Synced: {local_file} → shared (new)",
+                         f"{print_prefix}Error: Failed to sync {local_file} to shared"))
+    else:
+        # Walk through shared directory
+        for relative, shared_mtime in scan_tree(shared_root):
+            shared_path = shared_root / relative
+            local_path = SHARE_PATH / relative
+
+            # If only the shared copy exists, copy it to local
+            local_mtime = regular_file_mtime(local_path)
+            if local_mtime is None:
+                ensure_dir(os.path.dirname(local_path))
+                jobs.append((shared_path, local_path,
+                             f"{print_prefix}✓ Synced: shared → {local_path} (new)",
+                             f"{print_prefix}Error: Failed to sync {local_path} from shared"))
                 continue
-            print(f"{print_prefix}✓ Synced: shared → {local_file} (shared newer)")
-            count += 1
 
+            # Both exist, compare times once
+            delta = local_mtime - shared_mtime
+            if delta > MTIME_TOLERANCE:
+                jobs.append((local_path, shared_path,
+                             f"{print_prefix}✓ Synced: {local_path} → shared (local newer)",
+                             f"{print_prefix}Error: Failed to sync {local_path} to shared"))
+            elif delta < -MTIME_TOLERANCE:
+                jobs.append((shared_path, local_path,
+                             f"{print_prefix}✓ Synced: shared → {local_path} (shared newer)",
+                             f"{print_prefix}Error: Failed to sync {local_path} from shared"))
+
+    count = run_copies(jobs, **kwargs)
     if count == 0:
         if not kwargs.get('suppress_extra', False):
             print(f"{print_prefix}✓ Already up to date")
@@ -1027,6 +1394,7 @@ def cmd_sync_all(**kwargs):
 
     return 0
 
+
 def cmd_check(local_file, **kwargs):
     """Check the status of a file"""
     shared_root = kwargs.get('shared_root', SHARED_ROOT)
@@ -1035,67 +1403,75 @@ def cmd_check(local_file, **kwargs):
     if shared_path is None:
         return 1
 
-    local_exists = file_exists_and_valid(local_path)
+    local_mtime = regular_file_mtime(local_path)
+    local_exists = local_mtime is not None
     is_remote = isinstance(shared_path, str)
     if is_remote:
         r_user, r_host, r_path = parse_remote_path(shared_path)
         shared_exists = remote_file_exists(r_user, r_host, r_path)
     else:
-        shared_exists = shared_path.exists()
+        # One stat for both existence and, later, the mtime
+        shared_stat = stat_if_exists(shared_path)
+        shared_exists = shared_stat is not None
 
     print_prefix = kwargs.get('print_prefix', '')
-    print(f"{print_prefix}File: {local_file}")
-    print(f"{print_prefix}Shared path: {shared_path}")
-    print()
+    # Collect the report and write it in one go
+    out = [f"{print_prefix}File: {local_file}",
+           f"{print_prefix}Shared path: {shared_path}",
+           '']
 
     if not local_exists and not shared_exists:
-        print(f"{print_prefix}Status: ✗ Does not exist in either location")
+        out.append(f"{print_prefix}Status: ✗ Does not exist in either location")
+        _emit(out)
         return 0
 
     if not shared_exists:
-        print(f"{print_prefix}Status: ⊘ Not shared (only exists locally)")
+        out.append(f"{print_prefix}Status: ⊘ Not shared (only exists locally)")
         if not kwargs.get('suppress_extra', False):
             if local_exists:
-                local_time = format_time(local_path.stat().st_mtime)
-                print(f"{print_prefix}Local: Modified {local_time}")
-            print(f"{print_prefix}→ Use 'share put' or 'share push' to share")
+                local_time = format_time(local_mtime)
+                out.append(f"{print_prefix}Local: Modified {local_time}")
+            out.append(f"{print_prefix}→ Use 'share put' or 'share push' to share")
+        _emit(out)
         return 0
 
     if not local_exists:
-        print(f"{print_prefix}Status: ⊘ Only in shared (not in local)")
+        out.append(f"{print_prefix}Status: ⊘ Only in shared (not in local)")
         if not kwargs.get('suppress_extra', False):
             if is_remote:
                 remote_mtime = get_remote_mtime(r_user, r_host, r_path)
                 if remote_mtime is not None:
-                    print(f"{print_prefix}Shared: Modified {format_time(remote_mtime)}")
+                    out.append(f"{print_prefix}Shared: Modified {format_time(remote_mtime)}")
             else:
-                print(f"{print_prefix}Shared: Modified {format_time(shared_path.stat().st_mtime)}")
-            print(f"{print_prefix}→ Use 'share get' or 'share pull' to retrieve")
+                out.append(f"{print_prefix}Shared: Modified {format_time(shared_stat.st_mtime)}")
+            out.append(f"{print_prefix}→ Use 'share get' or 'share pull' to retrieve")
+        _emit(out)
         return 0
 
     # Both exist, compare
-    local_mtime = local_path.stat().st_mtime
-    shared_mtime = get_remote_mtime(r_user, r_host, r_path) if is_remote else shared_path.stat().st_mtime
+    shared_mtime = get_remote_mtime(r_user, r_host, r_path) if is_remote else shared_stat.st_mtime
 
-    local_time_str = format_time(local_mtime)
-    shared_time_str = format_time(shared_mtime) if shared_mtime is not None else "(unavailable)"
+    now = time.time()
+    local_time_str = format_time(local_mtime, now)
+    shared_time_str = format_time(shared_mtime, now) if shared_mtime is not None else "(unavailable)"
 
     if not kwargs.get('suppress_extra', False):
-        print(f"{print_prefix}Local:  Modified {local_time_str}")
-        print(f"{print_prefix}Shared: Modified {shared_time_str}")
-        print()
+        out.append(f"{print_prefix}Local:  Modified {local_time_str}")
+        out.append(f"{print_prefix}Shared: Modified {shared_time_str}")
+        out.append('')
 
     if shared_mtime is None:
-        print(f"{print_prefix}Status: ? Cannot compare (remote mtime unavailable)")
+        out.append(f"{print_prefix}Status: ? Cannot compare (remote mtime unavailable)")
     elif file_is_newer(local_mtime, shared_mtime):
-        print(f"{print_prefix}Status: ⚠ Local is newer")
-        print(f"{print_prefix}→ Use 'share push' to update shared")
+        out.append(f"{print_prefix}Status: ⚠ Local is newer")
+        out.append(f"{print_prefix}→ Use 'share push' to update shared")
     elif file_is_newer(shared_mtime, local_mtime):
-        print(f"{print_prefix}Status: ⚠ Shared is newer")
-        print(f"{print_prefix}→ Use 'share pull' to update local")
+        out.append(f"{print_prefix}Status: ⚠ Shared is newer")
+        out.append(f"{print_prefix}→ Use 'share pull' to update local")
     else:
-        print(f"{print_prefix}Status: ✓ Synced")
+        out.append(f"{print_prefix}Status: ✓ Synced")
 
+    _emit(out)
     return 0
 
 
@@ -1110,53 +1486,201 @@ def cmd_remove(local_file, **kwargs):
     if isinstance(shared_path, str):
         # remote remove
         # use ssh rm
-        import re
-        match = re.match(r'([^@]+)@([^:]+):(.*)', shared_path)
-        if not match:
-            print(f"{print_prefix}Invalid remote path: {shared_path}")
+        user, host, path = parse_remote_path(shared_path)
+        if not user:
+            locked_print(f"{print_prefix}Invalid remote path: {shared_path}")
             return 1
-        user, host, path = match.groups()
+        remote_batch = kwargs.get('remote_batch')
+        if remote_batch is not None:
+            # recursive remove: delete all files on this host with one ssh call later
+            remote_batch.setdefault((user, host), []).append(
+                (path, f"{print_prefix}✓ Removed from shared: {shared_path}"))
+            return 0
         try:
-            subprocess.run(['ssh', f'{user}@{host}', 'rm', '-f', path], check=True)
+            subprocess.run(['ssh', *ssh_options(), f'{user}@{host}', 'rm', '-f', path], check=True)
         except subprocess.CalledProcessError as e:
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Failed to remove remote file: {e}")
+                locked_print(f"{print_prefix}Error: Failed to remove remote file: {e}")
             return 1
-        print(f"{print_prefix}✓ Removed from shared: {shared_path}")
+        locked_print(f"{print_prefix}✓ Removed from shared: {shared_path}")
         # Clean up empty parent directories - not supported for remote
     else:
-        if not shared_path.exists():
+        # unlink reports a missing file itself; no separate exists() check
+        try:
+            shared_path.unlink()
+        except (FileNotFoundError, NotADirectoryError):
             if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}File not in shared: {local_file}")
+                locked_print(f"{print_prefix}File not in shared: {local_file}")
             return 0
+        locked_print(f"{print_prefix}✓ Removed from shared: {shared_path}")
 
-        shared_path.unlink()
-        print(f"{print_prefix}✓ Removed from shared: {shared_path}")
+        # Clean up empty parent directories, once at the end for recursive removes
+        prune_dirs = kwargs.get('prune_dirs')
+        if prune_dirs is not None:
+            prune_dirs.add(shared_path.parent)
+        else:
+            prune_empty_dirs([shared_path.parent], shared_root)
+
+    return 0
+
+
+def prune_empty_dirs(dirs, stop):
+    """Remove each directory in dirs and then its parents while they are empty,
+    never removing stop itself. rmdir refuses non-empty directories, so
+    nothing has to be listed first. Works on plain strings, as the walk up
+    only needs dirname."""
+    stop = str(stop)
+    for parent in sorted(map(str, dirs), key=lambda d: d.count(os.sep), reverse=True):
+        while parent != stop:
+            try:
+                os.rmdir(parent)
+            except OSError:
+                break
+            parent = os.path.dirname(parent)
 
-        # Clean up empty parent directories
-        try:
-            parent = shared_path.parent
-            while parent != shared_root and not any(parent.iterdir()):
-                parent.rmdir()
-                parent = parent.parent
-        except:
-            pass
 
+def remove_remote_files(user, host, entries, **kwargs):
+    """Remove remote files with a single ssh call that feeds NUL-separated paths
+    to xargs rm -f. entries are (remote path, message printed once removed);
+    returns the number of files that could not be removed."""
+    paths = b''.join(os.fsencode(path) + b'\0' for path, _ in entries)
+    try:
+        subprocess.run(['ssh', *ssh_options(), f'{user}@{host}', 'xargs -0 rm -f'],
+                       input=paths, stdout=subprocess.DEVNULL, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        if not kwargs.get('suppress_error', False):
+            locked_print(f"{kwargs.get('print_prefix', '')}Error: Failed to remove remote files: {e}")
+        return len(entries)
+    for _, message in entries:
+        locked_print(message)
     return 0
 
 
+def remove_recursive(path, skip_private=False, **kwargs):
+    """Remove path (a file or directory) from shared. Remote files are removed
+    in one batch per host, and emptied local shared directories are pruned in
+    one pass after all files are removed."""
+    prune_dirs = set()
+    remote_batch = {}
+    res = recursive_apply(cmd_remove, path, skip_private,
+                          prune_dirs=prune_dirs, remote_batch=remote_batch, **kwargs)
+    for (user, host), entries in remote_batch.items():
+        res += remove_remote_files(user, host, entries, **kwargs)
+    prune_empty_dirs(prune_dirs, kwargs.get('shared_root', SHARED_ROOT))
+    return res
+
+
+def _status_lines(synced, need_push, need_pull, only_shared=(), **kwargs):
+    """Build the per-category part of a status report as a list of lines"""
+    print_prefix = kwargs.get('print_prefix', '')
+    extra = not kwargs.get('suppress_extra', False)
+    out = []
+    if synced:
+        out.append(f"{print_prefix}✓ Synced: {len(synced)} files")
+        if extra:
+            out.extend(f"{print_prefix}  {f}" for f in synced[:5])
+            if len(synced) > 5:
+                out.append(f"{print_prefix}  ... and {len(synced) - 5} more")
+            out.append('')
+
+    if need_push:
+        out.append(f"{print_prefix}⚠ Need push (local newer): {len(need_push)} files")
+        if extra:
+            out.extend(f"{print_prefix}  {f}" for f in need_push)
+            out.append('')
+
+    if need_pull:
+        out.append(f"{print_prefix}⚠ Need pull (shared newer): {len(need_pull)} files")
+        if extra:
+            out.extend(f"{print_prefix}  {f}" for f in need_pull)
+            out.append('')
+
+    if only_shared:
+        out.append(f"{print_prefix}⊘ Only in shared: {len(only_shared)} files")
+        if extra:
+            out.extend(f"{print_prefix}  {local_f}" for local_f, _ in only_shared[:5])
+            if len(only_shared) > 5:
+                out.append(f"{print_prefix}  ... and {len(only_shared) - 5} more")
+            out.append('')
+
+    if not (synced or need_push or need_pull or only_shared):
+        out.append(f"{print_prefix}No files tracked")
+    return out
+
+
+def _shared_tree(shared_root):
+    """Return (relative, shared mtime, local path, local stat or None) for every
+    file under a local shared root; shared by status and auditall."""
+    # Join plain strings rather than building Path objects for every file
+    share_str = str(SHARE_PATH) if SHARE_PATH else ''
+    tree = [(relative, shared_mtime, os.path.join(share_str, relative))
+            for relative, shared_mtime in scan_tree(shared_root)]
+    local_stats = parallel_map(stat_if_exists, [local_file for _, _, local_file in tree])
+    return [(*item, local_stat) for item, local_stat in zip(tree, local_stats)]
+
+
+def _local_pairs(dirs, **kwargs):
+    """Yield (dir, shared_dir, pairs) for every existing directory in dirs;
+    shared by status and audit on local directories. pairs yields
+    (DirEntry, shared path, shared mtime) for each local file with a shared
+    counterpart, and is empty unless shared_dir is a local Path."""
+    print_prefix = kwargs.get('print_prefix', '')
+    shared_root = kwargs.get('shared_root', SHARED_ROOT)
+    # Honour --ignore while walking so ignored subtrees are never listed
+    ignore = compile_ignores(tuple(kwargs.get('ignore_patterns', [])))
+    for dir in dirs:
+        # Check existence and type with a single stat
+        dir_stat = stat_if_exists(dir)
+        if dir_stat is None:
+            if not kwargs.get('suppress_error', False):
+                print(f"{print_prefix}Error: Local directory does not exist: {dir}")
+            continue
+        if not stat.S_ISDIR(dir_stat.st_mode):
+            if not kwargs.get('suppress_error', False):
+                print(f"{print_prefix}Error: Not a directory: {dir}")
+            continue
+        shared_dir = get_shared_path(dir, shared_root)
+        yield dir, shared_dir, _walk_pairs(dir, shared_dir, shared_root, ignore)
+
+
+def _walk_pairs(dir, shared_dir, shared_root, ignore):
+    """Walk dir and yield the files that also exist in the shared root"""
+    if not isinstance(shared_dir, Path):
+        return
+    if SHARE_PATH is None:
+        # Files are then shared flat under their own name, not under a
+        # counterpart of dir, so map and stat each one as put does
+        for entry, _ in walk_scandir(dir, ignore=ignore):
+            shared_file = get_shared_path(entry.path, shared_root)
+            shared_stat = stat_if_exists(shared_file)
+            if shared_stat is not None:
+                yield entry, str(shared_file), shared_stat.st_mtime
+        return
+    # List the shared counterpart once and look local files up in it,
+    # rather than mapping and stat'ing a shared path per local file
+    shared_mtimes = dict(scan_tree(shared_dir))
+    if not shared_mtimes:
+        return
+    shared_str = str(shared_dir)
+    for entry, relative in walk_scandir(dir, ignore=ignore):
+        shared_mtime = shared_mtimes.get(relative)
+        if shared_mtime is not None:
+            yield entry, os.path.join(shared_str, relative), shared_mtime
+
+
 def cmd_status(**kwargs):
     """Show status of entire shared directory"""
     print_prefix = kwargs.get('print_prefix', '')
     shared_root = kwargs.get('shared_root', SHARED_ROOT)
     if isinstance(shared_root, str):
         user, host, remote_root = parse_remote_path(shared_root)
-        print(f"{print_prefix}Shared directory: {shared_root} (remote)")
-        print(f"{print_prefix}Local root: {SHARE_PATH if SHARE_PATH else 'Not set'}")
+        out = [f"{print_prefix}Shared directory: {shared_root} (remote)",
+               f"{print_prefix}Local root: {SHARE_PATH if SHARE_PATH else 'Not set'}"]
 
-        remote_files = list_remote_files(user, host, remote_root)
+        remote_files = list_remote_mtimes(user, host, remote_root)
         if not remote_files:
-            print(f"{print_prefix}No files tracked")
+            out.append(f"{print_prefix}No files tracked")
+            _emit(out)
             return 0
 
         synced = []
@@ -1164,76 +1688,38 @@ def cmd_status(**kwargs):
         need_pull = []
         only_shared = []
 
-        for remote_file in remote_files:
+        # Join plain strings rather than building Path objects for every file
+        share_str = str(SHARE_PATH) if SHARE_PATH else ''
+        tree = []
+        for remote_file, shared_mtime in remote_files:
             # Reconstruct local path from remote path
             if remote_root and remote_file.startswith(remote_root):
                 relative = remote_file[len(remote_root):].lstrip('/')
             else:
                 relative = remote_file.lstrip('/')
+            tree.append((remote_file, shared_mtime, os.path.join(share_str, relative)))
 
-            if SHARE_PATH:
-                local_file = SHARE_PATH / relative
-            else:
-                local_file = Path(relative)
-
-            if not local_file.exists():
-                only_shared.append((local_file, remote_file))
-                continue
-
-            local_mtime = local_file.stat().st_mtime
-            shared_mtime = get_remote_mtime(user, host, remote_file)
-
-            if shared_mtime is None:
+        # Stat the local side concurrently, as for a local shared root
+        local_stats = parallel_map(stat_if_exists, [local_file for _, _, local_file in tree])
+        for (remote_file, shared_mtime, local_file), local_stat in zip(tree, local_stats):
+            if local_stat is None:
                 only_shared.append((local_file, remote_file))
                 continue
 
-            if file_is_newer(local_mtime, shared_mtime):
+            delta = local_stat.st_mtime - shared_mtime
+            if delta > MTIME_TOLERANCE:
                 need_push.append(local_file)
-            elif file_is_newer(shared_mtime, local_mtime):
+            elif delta < -MTIME_TOLERANCE:
                 need_pull.append(local_file)
             else:
                 synced.append(local_file)
 
         total = len(synced) + len(need_push) + len(need_pull) + len(only_shared)
         if total > 0:
-            print(f"{print_prefix}Total files tracked: {total}")
-        print()
-
-        if synced:
-            print(f"{print_prefix}✓ Synced: {len(synced)} files")
-            if not kwargs.get('suppress_extra', False):
-                for f in synced[:5]:
-                    print(f"{print_prefix}  {f}")
-                if len(synced) > 5:
-                    print(f"{print_prefix}  ... and {len(synced) - 5} more")
-                print()
-
-        if need_push:
-            print(f"{print_prefix}⚠ Need push (local newer): {len(need_push)} files")
-            if not kwargs.get('suppress_extra', False):
-                for f in need_push:
-                    print(f"{print_prefix}  {f}")
-                print()
-
-        if need_pull:
-            print(f"{print_prefix}⚠ Need pull (shared newer): {len(need_pull)} files")
-            if not kwargs.get('suppress_extra', False):
-                for f in need_pull:
-                    print(f"{print_prefix}  {f}")
-                print()
-
-        if only_shared:
-            print(f"{print_prefix}⊘ Only in shared: {len(only_shared)} files")
-            if not kwargs.get('suppress_extra', False):
-                for local_f, _ in only_shared[:5]:
-                    print(f"{print_prefix}  {local_f}")
-                if len(only_shared) > 5:
-                    print(f"{print_prefix}  ... and {len(only_shared) - 5} more")
-                print()
-
-        if not (synced or need_push or need_pull or only_shared):
-            print(f"{print_prefix}No files tracked")
-
+            out.append(f"{print_prefix}Total files tracked: {total}")
+        out.append('')
+        out.extend(_status_lines(synced, need_push, need_pull, only_shared, **kwargs))
+        _emit(out)
         return 0
     if not shared_root.exists():
         if not kwargs.get('suppress_critical', False):
@@ -1251,73 +1737,29 @@ def cmd_status(**kwargs):
     only_shared = []
 
     # Walk through shared directory
-    for shared_file in shared_root.rglob('*'):
-        if not shared_file.is_file():
-            continue
-
-        # Reconstruct local path
-        relative = shared_file.relative_to(shared_root)
-        if SHARE_PATH:
-            local_file = SHARE_PATH / relative
-        else:
-            local_file = Path(relative)
-
-        if not local_file.exists():
-            only_shared.append((local_file, shared_file))
+    shared_str = str(shared_root)
+    for relative, shared_mtime, local_file, local_stat in _shared_tree(shared_root):
+        if local_stat is None:
+            # The shared path is only reported for files missing locally
+            only_shared.append((local_file, os.path.join(shared_str, relative)))
             continue
 
-        local_mtime = local_file.stat().st_mtime
-        shared_mtime = shared_file.stat().st_mtime
-
-        if file_is_newer(local_mtime, shared_mtime):
+        delta = local_stat.st_mtime - shared_mtime
+        if delta > MTIME_TOLERANCE:
             need_push.append(local_file)
-        elif file_is_newer(shared_mtime, local_mtime):
+        elif delta < -MTIME_TOLERANCE:
             need_pull.append(local_file)
         else:
             synced.append(local_file)
 
     total = len(synced) + len(need_push) + len(need_pull) + len(only_shared)
-    print(f"{print_prefix}Shared directory: {shared_root}")
-    print(f"{print_prefix}Local root: {SHARE_PATH if SHARE_PATH else 'Not set'}")
+    out = [f"{print_prefix}Shared directory: {shared_root}",
+           f"{print_prefix}Local root: {SHARE_PATH if SHARE_PATH else 'Not set'}"]
     if total > 0:
-        print(f"{print_prefix}Total files tracked: {total}")
-    print()
-
-    if synced:
-        print(f"{print_prefix}✓ Synced: {len(synced)} files")
-        if not kwargs.get('suppress_extra', False):
-            for f in synced[:5]:
-                print(f"{print_prefix}  {f}")
-            if len(synced) > 5:
-                print(f"{print_prefix}  ... and {len(synced) - 5} more")
-            print()
-
-    if need_push:
-        print(f"{print_prefix}⚠ Need push (local newer): {len(need_push)} files")
-        if not kwargs.get('suppress_extra', False):
-            for f in need_push:
-                print(f"{print_prefix}  {f}")
-            print()
-
-    if need_pull:
-        print(f"{print_prefix}⚠ Need pull (shared newer): {len(need_pull)} files")
-        if not kwargs.get('suppress_extra', False):
-            for f in need_pull:
-                print(f"{print_prefix}  {f}")
-            print()
-
-    if only_shared:
-        print(f"{print_prefix}⊘ Only in shared: {len(only_shared)} files")
-        if not kwargs.get('suppress_extra', False):
-            for local_f, shared_f in only_shared[:5]:
-                print(f"{print_prefix}  {local_f}")
-            if len(only_shared) > 5:
-                print(f"{print_prefix}  ... and {len(only_shared) - 5} more")
-            print()
-
-    if not (synced or need_push or need_pull or only_shared):
-        print(f"{print_prefix}No files tracked")
-
+        out.append(f"{print_prefix}Total files tracked: {total}")
+    out.append('')
+    out.extend(_status_lines(synced, need_push, need_pull, only_shared, **kwargs))
+    _emit(out)
     return 0
 
 
@@ -1341,34 +1783,14 @@ def cmd_status_local(dirs, **kwargs):
     valids = []
 
     # Walk through local directory
-    for dir in dirs:
-        # Check existence
-        if not Path(dir).exists():
-            if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Local directory does not exist: {dir}")
-            continue
-        if not Path(dir).is_dir():
-            if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Not a directory: {dir}")
-            continue
+    for dir, _, pairs in _local_pairs(dirs, **kwargs):
         valids.append(dir)
-        for local_file in Path(dir).rglob('*'):
-            if not local_file.is_file():
-                continue
-
-            shared_path = get_shared_path(local_file, shared_root)
-            if shared_path is None:
-                continue
-
-            if not shared_path.exists():
-                continue
-
-            local_mtime = local_file.stat().st_mtime
-            shared_mtime = shared_path.stat().st_mtime
-
-            if file_is_newer(local_mtime, shared_mtime):
+        for entry, _, shared_mtime in pairs:
+            local_file = Path(entry.path)
+            delta = entry.stat().st_mtime - shared_mtime
+            if delta > MTIME_TOLERANCE:
                 need_push.append(local_file)
-            elif file_is_newer(shared_mtime, local_mtime):
+            elif delta < -MTIME_TOLERANCE:
                 need_pull.append(local_file)
             else:
                 synced.append(local_file)
@@ -1378,229 +1800,125 @@ def cmd_status_local(dirs, **kwargs):
         print(f"{print_prefix}No valid local directories specified")
         return 0
     elif len(valids) == 1:
-        print(f"{print_prefix}Local directory: {valids[0]}")
+        out = [f"{print_prefix}Local directory: {valids[0]}"]
     else:
-        print(f"{print_prefix}Local directories: {', '.join(valids)}")
-    print(f"{print_prefix}Shared directory: {shared_root}")
+        out = [f"{print_prefix}Local directories: {', '.join(valids)}"]
+    out.append(f"{print_prefix}Shared directory: {shared_root}")
     if total > 0:
-        print(f"Total files tracked: {total}")
-    print()
-
-    if synced:
-        print(f"{print_prefix}✓ Synced: {len(synced)} files")
-        if not kwargs.get('suppress_extra', False):
-            for f in synced[:5]:
-                print(f"{print_prefix}  {f}")
-            if len(synced) > 5:
-                print(f"{print_prefix}  ... and {len(synced) - 5} more")
-            print()
-    
-    if need_push:
-        print(f"{print_prefix}⚠ Need push (local newer): {len(need_push)} files")
-        if not kwargs.get('suppress_extra', False):
-            for f in need_push:
-                print(f"{print_prefix}  {f}")
-            print()
-    
-    if need_pull:
-        print(f"{print_prefix}⚠ Need pull (shared newer): {len(need_pull)} files")
-        if not kwargs.get('suppress_extra', False):
-            for f in need_pull:
-                print(f"{print_prefix}  {f}")
-            print()
-
-    if not (synced or need_push or need_pull):
-        print(f"{print_prefix}No files tracked")
-
+        out.append(f"Total files tracked: {total}")
+    out.append('')
+    out.extend(_status_lines(synced, need_push, need_pull, **kwargs))
+    _emit(out)
     return 0
 
 
-def cmd_audit_all(**kwargs):
-    """Audit shared directory to check on files marked as synced"""
+def _audit_files(synced, **kwargs):
+    """Compare synced files and report the result; shared by audit and auditall.
+    synced holds ((st_dev, st_ino), local, shared, local_stat, shared_stat)
+    entries, where either stat may be None if the walk did not have it."""
     print_prefix = kwargs.get('print_prefix', '')
-    shared_root = kwargs.get('shared_root', SHARED_ROOT)
-    if SHARE_PATH is None:
-        if not kwargs.get('suppress_critical', False):
-            print(f"{print_prefix}Error: SHARE_PATH is not set. Cannot audit.")
-        return 1
 
-    if isinstance(shared_root, str):
-        print(f"{print_prefix}Audit all not supported for remote shared root")
-        return 1
-
-    synced = []
-
-    # Walk through shared directory
-    for shared_file in shared_root.rglob('*'):
-        if not shared_file.is_file():
-            continue
-
-        # Reconstruct local path
-        relative = shared_file.relative_to(shared_root)
-        if SHARE_PATH:
-            local_file = SHARE_PATH / relative
-        else:
-            local_file = Path(relative)
-
-        if not local_file.exists():
-            continue
-
-        local_mtime = local_file.stat().st_mtime
-        shared_mtime = shared_file.stat().st_mtime
-
-        if not file_is_newer(local_mtime, shared_mtime) and not file_is_newer(shared_mtime, local_mtime):
-            synced.append(local_file)   
+    # Compare in on-disk order so neighbouring files are read sequentially
+    synced = [entry[1:] for entry in sorted(synced, key=lambda e: e[0])]
 
     if not synced:
-        print("No synced files found")
+        print(f"{print_prefix}No synced files found")
         return 0
     else:
         print(f"{print_prefix}Auditing {len(synced)} synced files...\n")
-    
+
     mismatch = []
     match = []
 
-    for f in synced:
-        # Audit content by comparing hashes
-        shared_path = get_shared_path(f, shared_root)
-        if shared_path is None:
-            continue
-        if isinstance(shared_path, str):
-            print(f"{print_prefix}Cannot audit remote file: {f}")
-            continue
-        local_hash = hashlib.sha256()
-        shared_hash = hashlib.sha256()
-        with open(f, 'rb') as lf, open(shared_path, 'rb') as sf:
-            while True:
-                ldata = lf.read(65536)
-                sdata = sf.read(65536)
-                if not ldata and not sdata:
-                    break
-                local_hash.update(ldata)
-                shared_hash.update(sdata)
-        if local_hash.hexdigest() != shared_hash.hexdigest():
+    # Audit content by comparing both copies, several pairs at a time
+    for (f, *_), equal in zip(synced, compare_pairs(synced)):
+        if not equal:
             mismatch.append(f)
         else:
             match.append(f)
 
+    # Build the report and write it in one go
+    out = []
     if match:
-        print(f"{print_prefix}✓ Verified: {len(match)} files")
+        out.append(f"{print_prefix}✓ Verified: {len(match)} files")
         if not kwargs.get('suppress_extra', False):
-            for f in match[:5]:
-                print(f"{print_prefix}  {f}")
+            out.extend(f"{print_prefix}  {f}" for f in match[:5])
             if len(match) > 5:
-                print(f"{print_prefix}  ... and {len(match) - 5} more")
-            print()
+                out.append(f"{print_prefix}  ... and {len(match) - 5} more")
+            out.append('')
 
     if mismatch:
-        print(f"{print_prefix}⚠ Mismatch: {len(mismatch)} files\n")
+        out.append(f"{print_prefix}⚠ Mismatch: {len(mismatch)} files\n")
         if not kwargs.get('suppress_warning', False):
-            print(f"{print_prefix}  Since share cannot determine which version is correct,")
-            print(f"{print_prefix}  please manually resolve the mismatch by inspecting both local and shared versions.")
-            print(f"{print_prefix}  If you believe the shared version is correct, you can use 'share get' to overwrite local.")
-            print(f"{print_prefix}  If you believe the local version is correct, you can use 'share put' to overwrite shared.")
-            print()
+            out.append(f"{print_prefix}  Since share cannot determine which version is correct,")
+            out.append(f"{print_prefix}  please manually resolve the mismatch by inspecting both local and shared versions.")
+            out.append(f"{print_prefix}  If you believe the shared version is correct, you can use 'share get' to overwrite local.")
+            out.append(f"{print_prefix}  If you believe the local version is correct, you can use 'share put' to overwrite shared.")
+            out.append('')
         if not kwargs.get('suppress_extra', False):
-            for f in mismatch:
-                print(f"{print_prefix}  {f}")
-            print()
+            out.extend(f"{print_prefix}  {f}" for f in mismatch)
+            out.append('')
+    _emit(out)
 
     return 0
 
 
-def cmd_audit(dirs, **kwargs):
-    """Audit local directories to check on files marked as synced"""
+def cmd_audit_all(**kwargs):
+    """Audit shared directory to check on files marked as synced"""
     print_prefix = kwargs.get('print_prefix', '')
     shared_root = kwargs.get('shared_root', SHARED_ROOT)
-    if isinstance(shared_root, Path) and not shared_root.exists():
+    if SHARE_PATH is None:
         if not kwargs.get('suppress_critical', False):
-            print(f"{print_prefix}Error: Shared directory does not exist\nCreating {shared_root}...")
-        return 0
+            print(f"{print_prefix}Error: SHARE_PATH is not set. Cannot audit.")
+        return 1
+
+    if isinstance(shared_root, str):
+        print(f"{print_prefix}Audit all not supported for remote shared root")
+        return 1
 
     synced = []
 
-    for dir in dirs:
-        # Check existence
-        if not Path(dir).exists():
-            if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Local directory does not exist: {dir}")
-            continue
-        if not Path(dir).is_dir():
-            if not kwargs.get('suppress_error', False):
-                print(f"{print_prefix}Error: Not a directory: {dir}")
+    # Walk through shared directory
+    shared_str = str(shared_root)
+    for relative, shared_mtime, local_file, local_stat in _shared_tree(shared_root):
+        if local_stat is None:
             continue
-        for local_file in Path(dir).rglob('*'):
-            if not local_file.is_file():
-                continue
+        shared_file = os.path.join(shared_str, relative)
 
-            shared_path = get_shared_path(local_file, shared_root)
-            if shared_path is None:
-                continue
+        local_mtime = local_stat.st_mtime
 
-            if not shared_path.exists():
-                continue
+        if abs(local_mtime - shared_mtime) <= MTIME_TOLERANCE:
+            synced.append(((local_stat.st_dev, local_stat.st_ino), local_file, shared_file, local_stat, None))
 
-            local_mtime = local_file.stat().st_mtime
-            shared_mtime = shared_path.stat().st_mtime
+    return _audit_files(synced, **kwargs)
 
-            if not file_is_newer(local_mtime, shared_mtime) and not file_is_newer(shared_mtime, local_mtime):
-                synced.append(local_file)
 
-    if not synced:
-        print(f"{print_prefix}No synced files found")
+def cmd_audit(dirs, **kwargs):
+    """Audit local directories to check on files marked as synced"""
+    print_prefix = kwargs.get('print_prefix', '')
+    shared_root = kwargs.get('shared_root', SHARED_ROOT)
+    if isinstance(shared_root, Path) and not shared_root.exists():
+        if not kwargs.get('suppress_critical', False):
+            print(f"{print_prefix}Error: Shared directory does not exist\nCreating {shared_root}...")
         return 0
-    else:
-        print(f"{print_prefix}Auditing {len(synced)} synced files...\n")
 
-    mismatch = []
-    match = []
+    synced = []
 
-    for f in synced:
-        # Audit content by comparing hashes
-        shared_path = get_shared_path(f, shared_root)
-        if shared_path is None:
-            continue
-        if isinstance(shared_path, str):
-            print(f"{print_prefix}Cannot audit remote file: {f}")
+    for dir, shared_dir, pairs in _local_pairs(dirs, **kwargs):
+        if isinstance(shared_dir, str):
+            ignore = compile_ignores(tuple(kwargs.get('ignore_patterns', [])))
+            for entry, _ in walk_scandir(dir, ignore=ignore):
+                print(f"{print_prefix}Cannot audit remote file: {Path(entry.path)}")
             continue
-        local_hash = hashlib.sha256()
-        shared_hash = hashlib.sha256()
-        with open(f, 'rb') as lf, open(shared_path, 'rb') as sf:
-            while True:
-                ldata = lf.read(65536)
-                sdata = sf.read(65536)
-                if not ldata and not sdata:
-                    break
-                local_hash.update(ldata)
-                shared_hash.update(sdata)
-        if local_hash.hexdigest() != shared_hash.hexdigest():
-            mismatch.append(f)
-        else:
-            match.append(f)
+        for entry, shared_file, shared_mtime in pairs:
+            local_stat = entry.stat()
+            local_mtime = local_stat.st_mtime
 
-    if match:
-        print(f"{print_prefix}✓ Verified: {len(match)} files")
-        if not kwargs.get('suppress_extra', False):
-            for f in match[:5]:
-                print(f"{print_prefix}  {f}")
-            if len(match) > 5:
-                print(f"{print_prefix}  ... and {len(match) - 5} more")
-            print()
+            if abs(local_mtime - shared_mtime) <= MTIME_TOLERANCE:
+                synced.append(((local_stat.st_dev, local_stat.st_ino), Path(entry.path),
+                               shared_file, local_stat, None))
 
-    if mismatch:
-        print(f"{print_prefix}⚠ Mismatch: {len(mismatch)} files\n")
-        if not kwargs.get('suppress_warning', False):
-            print(f"{print_prefix}  Since share cannot determine which version is correct,")
-            print(f"{print_prefix}  please manually resolve the mismatch by inspecting both local and shared versions.")
-            print(f"{print_prefix}  If you believe the shared version is correct, you can use 'share get' to overwrite local.")
-            print(f"{print_prefix}  If you believe the local version is correct, you can use 'share put' to overwrite shared.")
-            print()
-        if not kwargs.get('suppress_extra', False):
-            for f in mismatch:
-                print(f"{print_prefix}  {f}")
-            print()
-
-    return 0
+    return _audit_files(synced, **kwargs)
 
 
 def cmd_list(**kwargs):
@@ -1610,27 +1928,29 @@ def cmd_list(**kwargs):
     if isinstance(shared_root, str):
         user, host, remote_root = parse_remote_path(shared_root)
         remote_files = list_remote_files(user, host, remote_root)
+        share_str = str(SHARE_PATH) if SHARE_PATH else ''
+        out = []
         for remote_file_path in remote_files:
             if not remote_file_path.startswith(remote_root):
-                print(f"{print_prefix}{remote_file_path}")
+                out.append(f"{print_prefix}{remote_file_path}")
                 continue
             rel = remote_file_path[len(remote_root):].lstrip('/')
-            if SHARE_PATH:
-                print(f"{print_prefix}{SHARE_PATH / rel}")
-            else:
-                print(f"{print_prefix}{rel}")
+            out.append(f"{print_prefix}{os.path.join(share_str, rel)}")
+        _emit(out)
         return 0
     if not shared_root.exists():
         return 1
 
-    for shared_file in shared_root.rglob('*'):
-        if shared_file.is_file():
-            # Show the path relative to shared_root, and if SHARE_PATH is set, show as under SHARE_PATH
-            relative = shared_file.relative_to(shared_root)
-            if SHARE_PATH:
-                print(f"{print_prefix}{SHARE_PATH / relative}")
-            else:
-                print(f"{print_prefix}{relative}")
+    # Buffer output and write it in batches rather than one print per file
+    out = []
+    # Show the path relative to shared_root, and if SHARE_PATH is set, show as under SHARE_PATH
+    share_str = str(SHARE_PATH) if SHARE_PATH else ''
+    for relative, _ in scan_tree(shared_root):
+        out.append(f"{print_prefix}{os.path.join(share_str, relative)}")
+        if len(out) >= 1024:
+            _emit(out)
+            out.clear()
+    _emit(out)
 
     return 0
 
@@ -1696,6 +2016,9 @@ def cmd_auto(**kwargs):
     # If in home directory, run syncall
     home = Path.home()
     current = Path.cwd()
+    # Resolve where we are once; every branch below only looks these up
+    current_parents = set(current.parents)
+    local_relative = current.relative_to(SHARE_PATH) if current == SHARE_PATH or SHARE_PATH in current_parents else None
     if current == home:
         if yes or ask_yes_no(f"{print_prefix}Sync all files?"):
             return cmd_sync_all(**kwargs)
@@ -1712,10 +2035,10 @@ def cmd_auto(**kwargs):
                 print(f"{print_prefix}No action taken.")
             return 0
     # If in a shared subdirectory, run audit on that directory
-    if isinstance(shared_root, Path) and shared_root in current.parents:
+    if isinstance(shared_root, Path) and shared_root in current_parents:
         relative = current.relative_to(shared_root)
         local_equiv = SHARE_PATH / relative if SHARE_PATH else None
-        if local_equiv and local_equiv.exists() and any(local_equiv.rglob('*')):
+        if local_equiv and has_entries(local_equiv):
             if yes or ask_yes_no(f"{print_prefix}Audit all synced files in the current shared subdirectory?"):
                 return cmd_audit([local_equiv], **kwargs)
             else:
@@ -1723,38 +2046,34 @@ def cmd_auto(**kwargs):
                     print(f"{print_prefix}No action taken.")
                 return 0
     # If in an empty directory and contents exists in shared, run pull
-    if current.is_dir() and not any(current.iterdir()):
-        relative = current.relative_to(SHARE_PATH) if SHARE_PATH and current.is_relative_to(SHARE_PATH) else None
-        if relative:
-            shared_equiv = shared_root / relative if isinstance(shared_root, Path) else None
-            if shared_equiv and shared_equiv.exists() and any(shared_equiv.iterdir()):
+    if has_entries(current) is False:
+        if local_relative is not None:
+            shared_equiv = shared_root / local_relative if isinstance(shared_root, Path) else None
+            if shared_equiv and has_entries(shared_equiv):
                 if yes or ask_yes_no(f"{print_prefix}The current directory is empty but has contents in shared. Pull all files?"):
                     return recursive_apply(cmd_pull, current, False, **kwargs)
                 else:
                     if not kwargs.get('suppress_extra', False):
                         print(f"{print_prefix}No action taken.")
                     return 0
-    # If in a local directory but no file in shared, run push
-    if SHARE_PATH and (SHARE_PATH in current.parents or current == SHARE_PATH):
-        relative = current.relative_to(SHARE_PATH)
-        shared_equiv = shared_root / relative if isinstance(shared_root, Path) else None
-        if shared_equiv is None or not shared_equiv.exists() or (shared_equiv.exists() and not any(shared_equiv.iterdir())):
-            if any(current.rglob('*')):
-                if yes or ask_yes_no(f"{print_prefix}The current local directory has files but none in shared. Push all files?"):
-                    return recursive_apply(cmd_push, current, True, **kwargs)
-                else:
-                    if not kwargs.get('suppress_extra', False):
-                        print(f"{print_prefix}No action taken.")
-                    return 0
-    # Otherwise, run sync on the current directory if it's under SHARE_PATH
-    if SHARE_PATH and (SHARE_PATH in current.parents or current == SHARE_PATH):
-        if any(current.rglob('*')):
-            if yes or ask_yes_no(f"{print_prefix}Sync all files in the current directory with shared?"):
-                return recursive_apply(cmd_sync, current, True, **kwargs)
+    # Both remaining actions need a non-empty directory under SHARE_PATH; check it once
+    if local_relative is not None and has_entries(current):
+        # If in a local directory but no file in shared, run push
+        shared_equiv = shared_root / local_relative if isinstance(shared_root, Path) else None
+        if shared_equiv is None or not has_entries(shared_equiv):
+            if yes or ask_yes_no(f"{print_prefix}The current local directory has files but none in shared. Push all files?"):
+                return recursive_apply(cmd_push, current, True, **kwargs)
             else:
                 if not kwargs.get('suppress_extra', False):
                     print(f"{print_prefix}No action taken.")
                 return 0
+        # Otherwise, run sync on the current directory
+        if yes or ask_yes_no(f"{print_prefix}Sync all files in the current directory with shared?"):
+            return recursive_apply(cmd_sync, current, True, **kwargs)
+        else:
+            if not kwargs.get('suppress_extra', False):
+                print(f"{print_prefix}No action taken.")
+            return 0
     # No applicable automatic action
     if not kwargs.get('suppress_extra', False):
         print(f"{print_prefix}No automatic action applicable in the current context.")
@@ -1778,8 +2097,7 @@ def cmd_config_path(new_sharepath, **kwargs):
         config_dir = find_config_dir()
     config_file = config_dir / '.sharepath'
     if not preview:
-        with open(config_file, 'w') as f:
-            f.write(str(SHARE_PATH))
+        write_config(config_file, str(SHARE_PATH))
     print(f"{print_prefix}✓ SHARE_PATH set to: {SHARE_PATH}")
     return 0
 
@@ -1805,8 +2123,7 @@ def cmd_config_root(new_shareroot, **kwargs):
         config_dir = find_config_dir()
     config_file = config_dir / '.shareroot'
     if not preview:
-        with open(config_file, 'w') as f:
-            f.write(str(SHARED_ROOT) + '\n')
+        write_config(config_file, str(SHARED_ROOT) + '\n')
     print(f"{print_prefix}✓ SHARED_ROOT set to: {SHARED_ROOT}")
     return 0
 
@@ -1836,9 +2153,7 @@ def cmd_config_root_add(new_shareroot, **kwargs):
         config_dir = find_config_dir()
     config_file = config_dir / '.shareroot'
     if not preview:
-        with open(config_file, 'w') as f:
-            for r in SHARED_ROOTS:
-                f.write(str(r) + '\n')
+        write_config(config_file, ''.join(f"{r}\n" for r in SHARED_ROOTS))
     print(f"{print_prefix}✓ Added root: {new_root} ({len(SHARED_ROOTS)} total roots)")
     return 0
 
@@ -1869,9 +2184,7 @@ def cmd_config_root_remove(target_root, **kwargs):
         config_dir = find_config_dir()
     config_file = config_dir / '.shareroot'
     if not preview:
-        with open(config_file, 'w') as f:
-            for r in SHARED_ROOTS:
-                f.write(str(r) + '\n')
+        write_config(config_file, ''.join(f"{r}\n" for r in SHARED_ROOTS))
     print(f"{print_prefix}✓ Removed root: {target} ({len(SHARED_ROOTS)} remaining)")
     return 0
 
@@ -1893,14 +2206,11 @@ def cmd_config_global_override(**kwargs):
     sharepath_file = override_dir / '.sharepath'
     if not sharepath_file.exists():
         if not preview:
-            with open(sharepath_file, 'w') as f:
-                f.write(str(SHARE_PATH) if SHARE_PATH else '')
+            write_config(sharepath_file, str(SHARE_PATH) if SHARE_PATH else '')
     shareroot_file = override_dir / '.shareroot'
     if not shareroot_file.exists():
         if not preview:
-            with open(shareroot_file, 'w') as f:
-                for r in SHARED_ROOTS:
-                    f.write(str(r) + '\n')
+            write_config(shareroot_file, ''.join(f"{r}\n" for r in SHARED_ROOTS))
     if not preview:
         print(f"{print_prefix}✓ Override config updated in current directory.")
     return 0
@@ -1926,6 +2236,139 @@ def cmd_config_global_remove(**kwargs):
 
 
 
+def cmd_version(**kwargs):
+    """Show version information"""
+    print(f"{kwargs.get('print_prefix', '')}share utility version 1.7")
+    return 0
+
+
+def cmd_author(**kwargs):
+    """Show author information"""
+    print(f"{kwargs.get('print_prefix', '')}Created by William Wu")
+    return 0
+
+
+def cmd_source(**kwargs):
+    """Show source code repository"""
+    print(f"{kwargs.get('print_prefix', '')}Source code repository: https://github.com/williamwutq/sheepshaver")
+    return 0
+
+
+# Command table: name -> (kind, handler, skip_private)
+#   'once'  - run once, independent of the shared roots
+#   'roots' - run once per shared root, no file arguments
+#   'dirs'  - run once per shared root with the full list of paths
+#   'files' - run once per shared root on every path via recursive_apply;
+#             skip_private=True skips dotfiles/private names
+#   'tree'  - like 'files', but the handler walks directories itself and is
+#             called as handler(path, skip_private, **kwargs)
+COMMANDS = {
+    'version':  ('once',  cmd_version,   None),
+    'author':   ('once',  cmd_author,    None),
+    'source':   ('once',  cmd_source,    None),
+    'info':     ('once',  cmd_info,      None),
+    'status':   ('roots', cmd_status,    None),
+    'pushall':  ('roots', cmd_push_all,  None),
+    'pullall':  ('roots', cmd_pull_all,  None),
+    'syncall':  ('roots', cmd_sync_all,  None),
+    'list':     ('roots', cmd_list,      None),
+    'auditall': ('roots', cmd_audit_all, None),
+    'auto':     ('roots', cmd_auto,      None),
+    'audit':    ('dirs',  cmd_audit,     None),
+    'put':      ('files', cmd_put,       True),
+    'push':     ('files', cmd_push,      True),
+    'get':      ('files', cmd_get,       False),
+    'pull':     ('files', cmd_pull,      False),
+    'sync':     ('files', cmd_sync,      True),
+    'check':    ('files', cmd_check,     True),
+    'rm':       ('tree',  remove_recursive, False),
+    'remove':   ('tree',  remove_recursive, False),
+    'ask':      ('files', cmd_ask,       True),
+    'touch':    ('files', cmd_ask,       True),
+}
+
+# 'config' sub-commands: name -> (kind, handler, name shown in errors).
+#   'path' - handler(path) with the rest of the arguments joined as the path
+#   'info' - show configuration through cmd_info
+#   'opts' - handler(**opts)
+# Two-word names are matched before one-word names.
+CONFIG_COMMANDS = {
+    'path':        ('path', cmd_config_path,            'path'),
+    'root':        ('path', cmd_config_root,            'root'),
+    'root add':    ('path', cmd_config_root_add,        'root add'),
+    'root remove': ('path', cmd_config_root_remove,     'root remove'),
+    'root rm':     ('path', cmd_config_root_remove,     'root remove'),
+    'show':        ('info', cmd_info,                   'show'),
+    'override':    ('opts', cmd_config_global_override, 'override'),
+    'remove':      ('opts', cmd_config_global_remove,   'remove'),
+}
+
+
+def dispatch_config(args, label, opts, **extra):
+    """Run a 'config' (label 'config') or 'config global' sub-command.
+    extra is passed on to the path and info handlers."""
+    print_prefix = opts.get('print_prefix', '')
+    words = [a.lower() for a in args[:2]]
+    spec, rest = CONFIG_COMMANDS.get(' '.join(words)), args[2:]
+    if spec is None or len(words) < 2:
+        spec, rest = CONFIG_COMMANDS.get(words[0] if words else ''), args[1:]
+    if spec is not None:
+        kind, handler, name = spec
+        if kind == 'info':
+            return handler(suppress_extra=True, suppress_critical=True, **extra)
+        if kind == 'opts':
+            return handler(**opts)
+        path_arg = ' '.join(rest)  # In case path contains spaces
+        if not path_arg:
+            print(f"{print_prefix}Error: '{label} {name}' requires a path argument")
+            return 1
+        return handler(path_arg, **extra)
+    subcommand = words[0] if words else ''
+    if subcommand in ('rm', 'delete'):
+        print(f"{print_prefix}Error: '{label} {subcommand}' is not a valid sub-command. Did you mean '{label} remove'?")
+    elif subcommand == 'local' and not extra:
+        print(f"{print_prefix}Error: 'config local' is not a valid sub-command. Did you mean 'config path <path>'?\n" \
+                f"{print_prefix}The current version of share does all operations locally.")
+    else:
+        print(f"{print_prefix}Error: Unknown {label} sub-command '{subcommand}'")
+    return 1
+
+
+# Words that are not commands but look like one, with what to say instead:
+# the rest of "Error: Unknown command '<word>'. " and any further lines
+SUGGESTIONS = {
+    'show':      ("Did you mean 'config show'?",),
+    'root':      ("Did you mean 'config root <path>'?",),
+    'path':      ("Did you mean 'config path <path>'?",),
+    'global':    ("Did you mean 'config global <subcommand>'?",),
+    'remote':    ("Did you mean 'config root <path>'?",),
+    'delete':    ("Did you mean 'rm' or 'remove'?",),
+    'commit':    ("Did you mean 'push' or 'put'?",
+                  "If you are using the git version control system, run 'git add' and 'git commit' instead. "
+                  "'share' does not require committing changes."),
+    'ls':        ("Did you mean 'list'?",),
+    'access':    ("Did you mean 'info'?",),
+    'override':  ("Did you mean 'config override'?",),
+    'alter':     ("Did you mean 'config root <path>' or 'config path <path>'?",),
+    'configure': ("Did you mean 'config <subcommand>'?",),
+    'change':    ("Did you mean 'config root <path>' or 'config path <path>'?",),
+    'issue':     ("Did you mean 'audit' or 'auditall'?",),
+    'verify':    ("Did you mean 'audit' or 'auditall'?",),
+    'local':     ("The current version of share does all operations locally.",
+                  "If you meant to edit the local configuration, use 'config path <path>'."),
+    'shared':    ("Did you mean 'list' or 'info'?",),
+    'update':    ("Did you mean 'pull' or 'pullall'?",
+                  "'share' is not automatically updatable; see Github source for updates. "
+                  "To obtain the github source, run 'source'."),
+    'create':    ("Did you mean 'ask' or 'push'?",
+                  "'share' does not require creating files; simply run 'put' or 'push' to add files to shared."),
+}
+
+# File commands whose paths are independent and I/O bound, so several paths
+# given on the command line are processed concurrently
+PARALLEL_COMMANDS = {'put', 'push', 'get', 'pull', 'sync', 'rm', 'remove', 'ask', 'touch'}
+
+
 def main():
     parser = argparse.ArgumentParser(
                 description='Share utility - Sync files between local and shared directory (support multiple files and directories)',
@@ -2053,226 +2496,62 @@ Examples:
             overall += run_fn(per_opts)
         return 0 if overall == 0 else 1
 
-    # Commands that don't require a file argument
-    if command == 'status' and len(file_paths) == 0:
-        return dispatch_with_roots(lambda o: cmd_status(**o))
-    elif command == 'version':
-        print(f"{print_prefix}share utility version 1.7")
-        return 0
-    elif command == 'author':
-        print(f"{print_prefix}Created by William Wu")
-        return 0
-    elif command == 'source':
-        print(f"{print_prefix}Source code repository: https://github.com/williamwutq/sheepshaver")
-        return 0
-    elif command == 'config':
+    if command == 'config':
         if len(file_paths) < 1:
             print(f"{print_prefix}Error: 'config' requires a sub-command")
             return 1
-        subcommand = file_paths[0].lower()
-        if subcommand == 'path':
-            path_arg = ' '.join(file_paths[1:])  # In case path contains spaces
-            if not path_arg:
-                print(f"{print_prefix}Error: 'config path' requires a path argument")
-                return 1
-            return cmd_config_path(path_arg)
-        elif subcommand == 'root':
-            if len(file_paths) > 1 and file_paths[1].lower() == 'add':
-                path_arg = ' '.join(file_paths[2:])
-                if not path_arg:
-                    print(f"{print_prefix}Error: 'config root add' requires a path argument")
-                    return 1
-                return cmd_config_root_add(path_arg)
-            elif len(file_paths) > 1 and file_paths[1].lower() in ('remove', 'rm'):
-                path_arg = ' '.join(file_paths[2:])
-                if not path_arg:
-                    print(f"{print_prefix}Error: 'config root remove' requires a path argument")
-                    return 1
-                return cmd_config_root_remove(path_arg)
-            path_arg = ' '.join(file_paths[1:])  # In case path contains spaces
-            if not path_arg:
-                print(f"{print_prefix}Error: 'config root' requires a path argument")
-                return 1
-            return cmd_config_root(path_arg)
-        elif subcommand == 'show':
-            return cmd_info(suppress_extra=True, suppress_critical=True)
-        elif subcommand == 'override':
-            return cmd_config_global_override(**opts)
-        elif subcommand == 'remove':
-            return cmd_config_global_remove(**opts)
-        elif subcommand == 'rm':
-            print(f"{print_prefix}Error: 'config rm' is not a valid sub-command. Did you mean 'config remove'?")
-            return 1
-        elif subcommand == 'delete':
-            print(f"{print_prefix}Error: 'config delete' is not a valid sub-command. Did you mean 'config remove'?")
-            return 1
-        elif subcommand == 'global':
-            subsubcommand = file_paths[1].lower() if len(file_paths) > 1 else ''
-            path_arg = ' '.join(file_paths[2:])  # In case path contains
-            if subsubcommand == 'path':
-                if not path_arg:
-                    print(f"{print_prefix}Error: 'config global path' requires a path argument")
-                    return 1
-                return cmd_config_path(path_arg, is_global=True)
-            elif subsubcommand == 'root':
-                if len(file_paths) > 2 and file_paths[2].lower() == 'add':
-                    path_arg = ' '.join(file_paths[3:])
-                    if not path_arg:
-                        print(f"{print_prefix}Error: 'config global root add' requires a path argument")
-                        return 1
-                    return cmd_config_root_add(path_arg, is_global=True)
-                elif len(file_paths) > 2 and file_paths[2].lower() in ('remove', 'rm'):
-                    path_arg = ' '.join(file_paths[3:])
-                    if not path_arg:
-                        print(f"{print_prefix}Error: 'config global root remove' requires a path argument")
-                        return 1
-                    return cmd_config_root_remove(path_arg, is_global=True)
-                if not path_arg:
-                    print(f"{print_prefix}Error: 'config global root' requires a path argument")
-                    return 1
-                return cmd_config_root(path_arg, is_global=True)
-            elif subsubcommand == 'show':
-                return cmd_info(suppress_extra=True, suppress_critical=True, is_global=True)
-            elif subsubcommand == 'override':
-                return cmd_config_global_override(**opts)
-            elif subsubcommand == 'remove':
-                return cmd_config_global_remove(**opts)
-            elif subsubcommand == 'rm':
-                print(f"{print_prefix}Error: 'config global rm' is not a valid sub-command. Did you mean 'config global remove'?")
-                return 1
-            elif subsubcommand == 'delete':
-                print(f"{print_prefix}Error: 'config global delete' is not a valid sub-command. Did you mean 'config global remove'?")
-                return 1
-            else:
-                print(f"{print_prefix}Error: Unknown config global sub-command '{subsubcommand}'")
-                return 1
-        elif subcommand == 'local':
-            print(f"{print_prefix}Error: 'config local' is not a valid sub-command. Did you mean 'config path <path>'?\n" \
-                    f"{print_prefix}The current version of share does all operations locally.")
-            return 1
-        else:
-            print(f"{print_prefix}Error: Unknown config sub-command '{subcommand}'")
-            return 1
-    elif command == 'pushall':
-        return dispatch_with_roots(lambda o: cmd_push_all(**o))
-    elif command == 'pullall':
-        return dispatch_with_roots(lambda o: cmd_pull_all(**o))
-    elif command == 'syncall':
-        return dispatch_with_roots(lambda o: cmd_sync_all(**o))
-    elif command == 'list':
-        return dispatch_with_roots(lambda o: cmd_list(**o))
-    elif command == 'auditall':
-        return dispatch_with_roots(lambda o: cmd_audit_all(**o))
-    elif command == 'info':
-        return cmd_info(**opts)
-    elif command == 'auto':
-        return dispatch_with_roots(lambda o: cmd_auto(**o))
-    elif command == 'show':
-        print(f"{print_prefix}Error: Unknown command 'show'. Did you mean 'config show'?")
-        return 1
-    elif command == 'root':
-        print(f"{print_prefix}Error: Unknown command 'root'. Did you mean 'config root <path>'?")
-        return 1
-    elif command == 'path':
-        print(f"{print_prefix}Error: Unknown command 'path'. Did you mean 'config path <path>'?")
-        return 1
-    elif command == 'global':
-        print(f"{print_prefix}Error: Unknown command 'global'. Did you mean 'config global <subcommand>'?")
-        return 1
-    elif command == 'remote':
-        print(f"{print_prefix}Error: Unknown command 'remote'. Did you mean 'config root <path>'?")
-        return 1
-    elif command == 'delete':
-        print(f"{print_prefix}Error: Unknown command 'delete'. Did you mean 'rm' or 'remove'?")
-        return 1
-    elif command == 'commit':
-        print(f"{print_prefix}Error: Unknown command 'commit'. Did you mean 'push' or 'put'?\n" \
-        f"{print_prefix}If you are using the git version control system, run 'git add' and 'git commit' instead. "\
-        "'share' does not require committing changes.")
-        return 1
-    elif command == 'ls':
-        print(f"{print_prefix}Error: Unknown command 'ls'. Did you mean 'list'?")
-        return 1
-    elif command == 'access':
-        print(f"{print_prefix}Error: Unknown command 'access'. Did you mean 'info'?")
-        return 1
-    elif command == 'override':
-        print(f"{print_prefix}Error: Unknown command 'override'. Did you mean 'config override'?")
-        return 1
-    elif command == 'alter':
-        print(f"{print_prefix}Error: Unknown command 'alter'. Did you mean 'config root <path>' or 'config path <path>'?")
+        if file_paths[0].lower() == 'global':
+            return dispatch_config(file_paths[1:], 'config global', opts, is_global=True)
+        return dispatch_config(file_paths, 'config', opts)
+    hint = SUGGESTIONS.get(command)
+    if hint is not None:
+        print(f"{print_prefix}Error: Unknown command '{command}'. {hint[0]}")
+        for line in hint[1:]:
+            print(f"{print_prefix}{line}")
         return 1
-    elif command == 'configure':
-        print(f"{print_prefix}Error: Unknown command 'configure'. Did you mean 'config <subcommand>'?")
-        return 1
-    elif command == 'change':
-        print(f"{print_prefix}Error: Unknown command 'change'. Did you mean 'config root <path>' or 'config path <path>'?")
-        return 1
-    elif command == 'issue':
-        print(f"{print_prefix}Error: Unknown command 'issue'. Did you mean 'audit' or 'auditall'?")
-        return 1
-    elif command == 'verify':
-        print(f"{print_prefix}Error: Unknown command 'verify'. Did you mean 'audit' or 'auditall'?")
-        return 1
-    elif command == 'local':
-        print(f"{print_prefix}Error: Unknown command 'local'. The current version of share does all operations locally.\n" \
-              "If you meant to edit the local configuration, use 'config path <path>'.")
-        return 1
-    elif command == 'shared':
-        print(f"{print_prefix}Error: Unknown command 'shared'. Did you mean 'list' or 'info'?")
-        return 1
-    elif command == 'update':
-        print(f"{print_prefix}Error: Unknown command 'update'. Did you mean 'pull' or 'pullall'?\n" \
-              f"{print_prefix}'share' is not automatically updatable; see Github source for updates. " \
-              "To obtain the github source, run 'source'.")
-        return 1
-    elif command == 'create':
-        print(f"{print_prefix}Error: Unknown command 'create'. Did you mean 'ask' or 'push'?\n" \
-              f"{print_prefix}'share' does not require creating files; simply run 'put' or 'push' to add files to shared.")
-        return 1
-    elif command == 'status' and len(file_paths) > 0:
-        return dispatch_with_roots(lambda o: cmd_status_local(file_paths, **o))
-
-    # Dispatch to appropriate command
-    # Tuple: (handler_fn, skip_private) — skip_private=True skips dotfiles/private names
-    file_commands = {
-        'put':    (cmd_put,    True),
-        'push':   (cmd_push,   True),
-        'get':    (cmd_get,    False),
-        'pull':   (cmd_pull,   False),
-        'sync':   (cmd_sync,   True),
-        'check':  (cmd_check,  True),
-        'rm':     (cmd_remove, False),
-        'remove': (cmd_remove, False),
-        'ask':    (cmd_ask,    True),
-        'touch':  (cmd_ask,    True),
-    }
-    dir_commands = {
-        'audit': cmd_audit,
-    }
-
-    if command not in file_commands and command not in dir_commands:
+
+    spec = COMMANDS.get(command)
+    if spec is None:
         if path_exists_and_valid(command) and command not in ['.', '..']:
             return dispatch_with_roots(lambda o: recursive_apply(cmd_sync, command, True, **o))
         print(f"{print_prefix}Error: Unknown command '{command}'")
         print(f"{print_prefix}Use 'share --help' for usage information")
         return 1
 
+    kind, cmd_fn, skip_prv = spec
+    if command == 'status' and file_paths:
+        # 'status' with directories reports on those directories only
+        kind, cmd_fn = 'dirs', cmd_status_local
+
+    if kind == 'once':
+        return cmd_fn(**opts)
+    if kind == 'roots':
+        return dispatch_with_roots(lambda o: cmd_fn(**o))
+
     if not file_paths:
         print(f"{print_prefix}Error: '{command}' require at least one file path argument")
         return 1
 
-    if command in dir_commands:
-        # dir-argument commands (audit) receive the full file_paths list
-        return dispatch_with_roots(lambda o: dir_commands[command](file_paths, **o))
+    if kind == 'dirs':
+        # dir-argument commands (audit, status) receive the full file_paths list
+        return dispatch_with_roots(lambda o: cmd_fn(file_paths, **o))
+
+    # 'tree' handlers walk directories themselves; 'files' handlers run per file
+    if kind == 'tree':
+        apply = cmd_fn
+    else:
+        apply = functools.partial(recursive_apply, cmd_fn)
 
-    cmd_fn, skip_prv = file_commands[command]
     if len(file_paths) > 1:
         # Multiple files: iterate files per root
         def run_multi_files(o):
-            res = 0
-            for f in file_paths:
-                res += recursive_apply(cmd_fn, f, skip_prv, **o)
+            if command in PARALLEL_COMMANDS:
+                with ThreadPoolExecutor(max_workers=min(MAX_WORKERS, len(file_paths))) as ex:
+                    res = sum(ex.map(lambda f: apply(f, skip_prv, **o), file_paths))
+            else:
+                res = 0
+                for f in file_paths:
+                    res += apply(f, skip_prv, **o)
             if res != 0:
                 print(f"{o.get('print_prefix', '')}⚠ '{command}' completed with {res} errors")
                 return 1
@@ -2280,7 +2559,7 @@ Examples:
         return dispatch_with_roots(run_multi_files)
     else:
         # Single file or directory
-        return dispatch_with_roots(lambda o: recursive_apply(cmd_fn, file_paths[0], skip_prv, **o))
+        return dispatch_with_roots(lambda o: apply(file_paths[0], skip_prv, **o))
 
 
 if __name__ == "__main__":